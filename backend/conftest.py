@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the backend tests.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+from main import GameRoom
+
+
+@pytest.fixture
+def room():
+    """Create a fresh game room for each test."""
+    room = GameRoom("test-room", "Test Host")
+    room.host_ws = AsyncMock()
+    yield room
+    room.cancel_auto_advance()
+    if room.timer_task:
+        room.timer_task.cancel()
+
+
+@pytest.fixture
+def room_with_players(room):
+    """Create a room with 3 connected players."""
+    room.players = {
+        "player1": {"name": "Alice", "score": 0, "ws": AsyncMock(), "connected": True},
+        "player2": {"name": "Bob", "score": 0, "ws": AsyncMock(), "connected": True},
+        "player3": {"name": "Charlie", "score": 0, "ws": AsyncMock(), "connected": True},
+    }
+    return room
@@ -0,0 +1,219 @@
+"""
+Game history recording and offline analytics.
+
+When HISTORY_DIR is set, rooms record question starts, answer submissions,
+reveals and score changes as newline-delimited JSON, one file per room.
+`record()` only appends the event to an in-memory buffer; a background writer
+encodes and appends buffered events from a worker thread every
+HISTORY_FLUSH_SECONDS (sooner once the buffer fills), so the event loop never
+waits on the disk.
+
+Aggregate many games into per-question accuracy and response times:
+
+    python history.py aggregate history/ [--json]
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+import anyio
+
+import metrics
+from tracing import percentile
+
+HISTORY_DIR = os.getenv("HISTORY_DIR") or None
+FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_SECONDS", "1"))
+
+# Buffered events that trigger an early flush, and the cap past which new events
+# are dropped rather than let a stuck disk grow memory without bound
+FLUSH_THRESHOLD = 1000
+MAX_BUFFERED = 100_000
+
+CHUNK_SIZE = 64 * 1024
+
+# Room ids become file names, so only plain ids are accepted
+ROOM_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class EventSink:
+    """Buffered, append-only NDJSON history per room"""
+
+    def __init__(self, directory: Optional[str] = HISTORY_DIR, flush_interval: float = FLUSH_INTERVAL):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self.buffer: dict[str, list[dict]] = {}  # room_id -> events not yet written
+        self.buffered = 0
+        self.wake: Optional[asyncio.Event] = None
+        self.writer: Optional[asyncio.Task] = None
+        # Keeps flushes in order when the writer and an export flush at once
+        self.write_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def path_for(self, room_id: str) -> Optional[Path]:
+        if not self.enabled or not ROOM_ID_PATTERN.fullmatch(room_id):
+            return None
+        return self.directory / f"{room_id}.ndjson"
+
+    def record(self, room_id: str, event: str, **fields):
+        """Buffer one event for a room; O(1) and never touches the disk"""
+        if not self.enabled or not ROOM_ID_PATTERN.fullmatch(room_id):
+            return
+        if self.buffered >= MAX_BUFFERED:
+            metrics.history_dropped.inc()
+            return
+        self.buffer.setdefault(room_id, []).append(
+            {"event": event, "room_id": room_id, "ts": round(time.time(), 3), **fields}
+        )
+        self.buffered += 1
+        metrics.history_events.inc(event)
+        if self.writer is None or self.writer.done():
+            self.wake = asyncio.Event()
+            self.writer = asyncio.create_task(self._run())
+        elif self.buffered >= FLUSH_THRESHOLD:
+            self.wake.set()
+
+    async def _run(self):
+        while self.buffered:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write everything buffered so far"""
+        if not self.buffered:
+            return
+        pending, self.buffer, self.buffered = self.buffer, {}, 0
+        async with self.write_lock:
+            await anyio.to_thread.run_sync(self._write, pending)
+
+    def _write(self, pending: dict[str, list[dict]]):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for room_id, events in pending.items():
+                lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+                with open(self.path_for(room_id), "a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError as e:
+            metrics.history_dropped.inc(amount=sum(len(events) for events in pending.values()))
+            print(f"Error writing game history: {e}")
+
+    async def close(self):
+        """Stop the writer and flush what is left (on shutdown)"""
+        if self.writer:
+            self.writer.cancel()
+            self.writer = None
+        await self.flush()
+
+    def room_files(self) -> list[Path]:
+        if not self.enabled or not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.ndjson"))
+
+
+async def stream_files(paths: Iterable[Path]) -> AsyncIterator[bytes]:
+    """Stream history files in chunks without loading them into memory"""
+    for path in paths:
+        async with await anyio.open_file(path, "rb") as f:
+            while chunk := await f.read(CHUNK_SIZE):
+                yield chunk
+
+
+sink = EventSink()
+
+
+def iter_events(paths: Iterable[Path]) -> Iterator[dict]:
+    """Events from history files or directories of them, skipping damaged lines"""
+    for path in paths:
+        files = sorted(path.glob("*.ndjson")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+
+def aggregate(events: Iterable[dict]) -> list[dict]:
+    """Per-question accuracy and response-time distribution across many games"""
+    questions: dict[str, dict] = {}
+
+    def stats_for(event: dict) -> dict:
+        question_id = event.get("question_id") or "unknown"
+        if question_id not in questions:
+            questions[question_id] = {
+                "question_id": question_id, "category": None, "games": 0, "answers": 0,
+                "correct": 0, "no_answer": 0, "answer_counts": {}, "latencies": []
+            }
+        return questions[question_id]
+
+    for event in events:
+        kind = event.get("event")
+        if kind == "question_started":
+            stats = stats_for(event)
+            stats["games"] += 1
+            stats["category"] = stats["category"] or event.get("category")
+        elif kind == "answer_submitted":
+            stats = stats_for(event)
+            stats["answers"] += 1
+            stats["correct"] += 1 if event.get("is_correct") else 0
+            answer = str(event.get("answer"))
+            stats["answer_counts"][answer] = stats["answer_counts"].get(answer, 0) + 1
+            if isinstance(event.get("latency_ms"), (int, float)):
+                stats["latencies"].append(event["latency_ms"])
+        elif kind == "answer_revealed":
+            stats = stats_for(event)
+            stats["no_answer"] += sum(1 for result in event.get("results", []) if result.get("answer") is None)
+
+    report = []
+    for stats in questions.values():
+        latencies = sorted(stats.pop("latencies"))
+        stats["accuracy"] = round(stats["correct"] / stats["answers"], 3) if stats["answers"] else None
+        stats["latency_ms"] = {
+            "mean": round(sum(latencies) / len(latencies), 1),
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+        } if latencies else None
+        report.append(stats)
+    # Hardest questions first
+    report.sort(key=lambda s: (s["accuracy"] is None, s["accuracy"] or 0))
+    return report
+
+
+def print_report(report: list[dict]):
+    print(f"{'question':<24} {'category':<20} {'games':>5} {'answers':>7} {'accuracy':>8} {'p50 ms':>8} {'p90 ms':>8}")
+    for stats in report:
+        accuracy = f"{stats['accuracy']:.0%}" if stats["accuracy"] is not None else "-"
+        latency = stats["latency_ms"] or {}
+        print(
+            f"{str(stats['question_id'])[:24]:<24} {str(stats['category'] or '-')[:20]:<20} "
+            f"{stats['games']:>5} {stats['answers']:>7} {accuracy:>8} "
+            f"{latency.get('p50', '-'):>8} {latency.get('p90', '-'):>8}"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    paths = [Path(arg) for arg in args[1:] if arg != "--json"]
+    if not args or args[0] != "aggregate" or not paths:
+        print("Usage: python history.py aggregate <history dir or files...> [--json]")
+        sys.exit(1)
+    result = aggregate(iter_events(paths))
+    if as_json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
@@ -0,0 +1,352 @@
+"""
+Headless load generator and benchmark for the WebSocket game loop.
+
+Starts the app locally with uvicorn (or targets --url) and drives simulated
+hosts and players over real WebSockets through a scripted game:
+
+  join      every player in every room connects at once
+  buzz      boat-race buzz storm before the first question
+  answer    all players submit an answer as soon as a question starts
+  reveal    host reveals, measured until the last phone has the result
+
+Reports p50/p99 latency per phase, message throughput and server CPU/RSS.
+
+Run with: python loadtest.py --rooms 4 --players 100
+Use --json to write a machine-readable baseline for tracking across releases.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+import websockets
+
+QUESTION = {
+    "id": "load1",
+    "question": "Load test question?",
+    "options": ["A", "B", "C", "D"],
+    "correct_answer": "B",
+    "points": 100,
+}
+
+
+def percentile(samples: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for an empty sample"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class SimClient:
+    """One simulated host or player socket with awaitable message types"""
+
+    def __init__(self, url: str, stats: "Stats"):
+        self.url = url
+        self.stats = stats
+        self.ws = None
+        self.reader: Optional[asyncio.Task] = None
+        self.waiters: list[tuple] = []  # (predicate, future)
+        self.last: dict[str, dict] = {}  # type -> latest message
+
+    async def connect(self) -> dict:
+        self.ws = await websockets.connect(self.url, max_size=None, open_timeout=60)
+        init = json.loads(await self.ws.recv())
+        self.stats.received += 1
+        self.reader = asyncio.create_task(self._read())
+        return init
+
+    async def _read(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                self.stats.received += 1
+                self.last[message.get("type")] = message
+                arrived = time.perf_counter()
+                for waiter in list(self.waiters):
+                    predicate, future = waiter
+                    if not future.done() and predicate(message):
+                        future.set_result((arrived, message))
+                        self.waiters.remove(waiter)
+                if message.get("type") == "ping":
+                    await self.ws.send(json.dumps({"type": "pong", "t": message["t"]}))
+                if "seq" in message:
+                    # Ack traced frames like the real clients do
+                    await self.ws.send(json.dumps({"type": "ack", "seq": message["seq"]}))
+        except websockets.ConnectionClosed:
+            pass
+
+    def expect(self, predicate) -> asyncio.Future:
+        """Future resolved with (arrival time, message) for the next match"""
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((predicate, future))
+        return future
+
+    async def send(self, message: dict):
+        self.stats.sent += 1
+        await self.ws.send(json.dumps(message))
+
+    async def close(self):
+        if self.ws:
+            await self.ws.close()
+        if self.reader:
+            await self.reader
+
+
+class Stats:
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.latencies: dict[str, list[float]] = {}
+        self.durations: dict[str, float] = {}
+        self.timeouts = 0
+
+    def record(self, phase: str, seconds: float):
+        self.latencies.setdefault(phase, []).append(seconds)
+
+
+def is_type(msg_type: str):
+    return lambda message: message.get("type") == msg_type
+
+
+async def wait(stats: Stats, future: asyncio.Future, timeout: float):
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        stats.timeouts += 1
+        return None
+
+
+def create_room(http_url: str) -> str:
+    request = urllib.request.Request(
+        f"{http_url}/api/rooms",
+        data=json.dumps({"host_name": "loadtest"}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["room_id"]
+
+
+async def run_room(ws_url: str, http_url: str, args, stats: Stats, barrier: asyncio.Barrier, index: int):
+    room_id = await asyncio.to_thread(create_room, http_url)
+    host = SimClient(f"{ws_url}/ws/host/{room_id}", stats)
+    await host.connect()
+    if args.trace:
+        traced = host.expect(is_type("tracing_updated"))
+        await host.send({"type": "set_tracing", "enabled": True})
+        await wait(stats, traced, args.timeout)
+
+    # Join storm
+    players = [SimClient(f"{ws_url}/ws/player/{room_id}/p{index}-{i}", stats) for i in range(args.players)]
+    await barrier.wait()
+
+    async def join(player):
+        started = time.perf_counter()
+        init = await player.connect()
+        stats.record("join", time.perf_counter() - started)
+        player.player_id = init["player_id"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(join(p) for p in players))
+    stats.durations["join"] = max(stats.durations.get("join", 0), time.perf_counter() - started)
+    await barrier.wait()
+
+    # Boat-race buzz storm: each buzz is timed until the player's own boat moves forward
+    async def buzz(player):
+        position = 0.0
+        for _ in range(args.buzzes):
+            moved = player.expect(
+                lambda m, floor=position: m.get("type") == "mini_game_update"
+                and m["positions"].get(player.player_id, {}).get("position", 0) > floor
+            )
+            started = time.perf_counter()
+            await player.send({"type": "buzz"})
+            result = await wait(stats, moved, args.timeout)
+            if result is None:
+                return
+            arrived, message = result
+            stats.record("buzz", arrived - started)
+            entry = message["positions"][player.player_id]
+            position = entry["position"]
+            if entry["finished"]:
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(*(buzz(p) for p in players))
+    stats.durations["buzz"] = max(stats.durations.get("buzz", 0), time.perf_counter() - started)
+    await barrier.wait()
+
+    for _ in range(args.questions):
+        # Answer burst: everyone answers the moment the question starts
+        started_futures = [p.expect(is_type("question_started")) for p in players]
+        all_counted = host.expect(
+            lambda m: m.get("type") == "answer_count_update" and m["count"] >= len(players)
+        )
+        await host.send({"type": "start_question", "question": QUESTION})
+
+        async def answer(player, started_future):
+            if await wait(stats, started_future, args.timeout) is None:
+                return
+            confirmed = player.expect(is_type("answer_confirmed"))
+            started = time.perf_counter()
+            await player.send({"type": "submit_answer", "answer": "B"})
+            result = await wait(stats, confirmed, args.timeout)
+            if result:
+                stats.record("answer", result[0] - started)
+
+        burst_started = time.perf_counter()
+        await asyncio.gather(*(answer(p, f) for p, f in zip(players, started_futures)))
+        result = await wait(stats, all_counted, args.timeout)
+        if result:
+            stats.record("answer_count_to_host", result[0] - burst_started)
+        stats.durations["answer"] = stats.durations.get("answer", 0) + time.perf_counter() - burst_started
+
+        # Reveal fan-out: time until each phone (and the last one) has the result
+        revealed = [p.expect(is_type("answer_revealed")) for p in players]
+        started = time.perf_counter()
+        await host.send({"type": "reveal_answer"})
+        last = None
+        for result in await asyncio.gather(*(wait(stats, f, args.timeout) for f in revealed)):
+            if result:
+                stats.record("reveal", result[0] - started)
+                last = max(last or 0, result[0] - started)
+        if last is not None:
+            stats.record("reveal_last_phone", last)
+        stats.durations["reveal"] = stats.durations.get("reveal", 0) + time.perf_counter() - started
+
+        cleared = host.expect(is_type("question_cleared"))
+        await host.send({"type": "next_question"})
+        await wait(stats, cleared, args.timeout)
+
+    await asyncio.gather(*(p.close() for p in players))
+    await host.close()
+
+
+def read_process_usage(pid: int) -> dict:
+    """CPU seconds and peak RSS of the server process (Linux /proc only)"""
+    usage = {"cpu_seconds": None, "peak_rss_mb": None}
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        usage["cpu_seconds"] = (int(fields[11]) + int(fields[12])) / ticks
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    usage["peak_rss_mb"] = int(line.split()[1]) / 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    return usage
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=Path(__file__).parent,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not start within 30s")
+
+
+async def run(args) -> dict:
+    server = None
+    if args.url:
+        http_url = args.url.rstrip("/")
+    else:
+        port = free_port()
+        server = start_server(port)
+        http_url = f"http://127.0.0.1:{port}"
+    ws_url = "ws" + http_url[len("http"):]
+
+    stats = Stats()
+    baseline = read_process_usage(server.pid) if server else {}
+    barrier = asyncio.Barrier(args.rooms)
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(run_room(ws_url, http_url, args, stats, barrier, i) for i in range(args.rooms)))
+        elapsed = time.perf_counter() - started
+        usage = read_process_usage(server.pid) if server else {}
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "rooms": args.rooms,
+        "players_per_room": args.players,
+        "elapsed_seconds": round(elapsed, 3),
+        "messages_sent": stats.sent,
+        "messages_received": stats.received,
+        "throughput_msgs_per_second": round((stats.sent + stats.received) / elapsed, 1),
+        "timeouts": stats.timeouts,
+        "phases": {},
+    }
+    for phase, samples in stats.latencies.items():
+        report["phases"][phase] = {
+            "count": len(samples),
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            "max_ms": round(max(samples) * 1000, 2),
+        }
+    if usage.get("cpu_seconds") is not None:
+        report["server_cpu_seconds"] = round(usage["cpu_seconds"] - baseline["cpu_seconds"], 3)
+        report["server_peak_rss_mb"] = round(usage["peak_rss_mb"], 1)
+    return report
+
+
+def print_report(report: dict):
+    print(f"{report['rooms']} rooms x {report['players_per_room']} players in {report['elapsed_seconds']}s")
+    print(f"throughput: {report['throughput_msgs_per_second']} msgs/s "
+          f"({report['messages_sent']} sent, {report['messages_received']} received, {report['timeouts']} timeouts)")
+    if "server_cpu_seconds" in report:
+        print(f"server: {report['server_cpu_seconds']} CPU s, {report['server_peak_rss_mb']} MB peak RSS")
+    print(f"{'phase':<22}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for phase, row in report["phases"].items():
+        print(f"{phase:<22}{row['count']:>8}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quiz Night WebSocket load test")
+    parser.add_argument("--rooms", type=int, default=1, help="simultaneous rooms")
+    parser.add_argument("--players", type=int, default=50, help="players per room")
+    parser.add_argument("--buzzes", type=int, default=8, help="boat-race buzzes per player")
+    parser.add_argument("--questions", type=int, default=3, help="answer/reveal rounds")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds to wait for any expected frame")
+    parser.add_argument("--trace", action="store_true", help="enable latency tracing in every room")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
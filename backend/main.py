@@ -1,19 +1,85 @@
+import startup  # first, so the import time of everything else is measured
 import os
 import json
+import time
+import secrets
+import string
 import uuid
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
-from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from dotenv import load_dotenv
 
-load_dotenv()
+startup.mark("framework imports")
+
+
+def find_env_file() -> Optional[str]:
+    """The nearest .env at or above this directory, where load_dotenv() would look"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# Settings load before the modules below, which read them at import time.
+# Deployed containers are configured through the environment and have no .env,
+# so python-dotenv is only imported when there is one to read.
+env_file = find_env_file()
+if env_file:
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
+startup.mark("settings")
+
+import history
+import media
+import metrics
+import tracing
+from profiler import profiler
+from spectators import SpectatorHub
+from tournament import Tournament
+from question_store import get_question_store
+
+startup.mark("app imports")
+
+
+async def preload_catalog():
+    """Warm the question store off the event loop once the server is accepting requests"""
+    try:
+        await asyncio.to_thread(get_question_store().preload)
+    except Exception as e:
+        print(f"Error preloading questions: {e}")
+    startup.milestone("catalog preloaded")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background probe feeding the event-loop lag histogram on /metrics
+    loop_monitor = asyncio.create_task(metrics.monitor_event_loop())
+    if profiler.enabled:
+        profiler.start_lag_sampler()
+    # Not needed to serve the first request, so it never delays readiness
+    catalog_preload = asyncio.create_task(preload_catalog())
+    startup.mark("lifespan")
+    startup.milestone("ready")
+    print(startup.summary())
+    yield
+    catalog_preload.cancel()
+    loop_monitor.cancel()
+    await history.sink.close()
 
-app = FastAPI(title="Quiz Night API")
+
+app = FastAPI(title="Quiz Night API", lifespan=lifespan)
 
 # CORS configuration
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001,http://localhost:5173,http://localhost:5174").split(",")
@@ -25,14 +91,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load questions from JSON file
-QUESTIONS_FILE = Path(__file__).parent / "questions.json"
+# Application-level ping interval; connections silent for HEARTBEAT_TIMEOUT are reaped
+HEARTBEAT_INTERVAL = float(os.getenv("HEARTBEAT_INTERVAL_SECONDS", "10"))
+HEARTBEAT_TIMEOUT = float(os.getenv("HEARTBEAT_TIMEOUT_SECONDS", "30"))
+
+
+async def close_quietly(ws: WebSocket):
+    try:
+        await ws.close()
+    except Exception:
+        pass
+
+
+# Minimum interval between live answer_distribution frames to the host
+ANSWER_DISTRIBUTION_INTERVAL = float(os.getenv("ANSWER_DISTRIBUTION_INTERVAL_MS", "250")) / 1000
+
+# Default pause between a reveal and the next queued question when auto-advance is on
+AUTO_ADVANCE_PAUSE = float(os.getenv("AUTO_ADVANCE_SECONDS", "5"))
+MAX_QUEUED_QUESTIONS = 100
 
-def load_questions():
-    if QUESTIONS_FILE.exists():
-        with open(QUESTIONS_FILE, "r") as f:
-            return json.load(f)
-    return {"categories": {}}
 
 # In-memory game state
 class GameRoom:
@@ -40,21 +117,116 @@ class GameRoom:
         self.room_id = room_id
         self.host_name = host_name
         self.host_ws: Optional[WebSocket] = None
-        self.players: dict[str, dict] = {}  # player_id -> {name, score, ws, connected}
+        self.host_last_seen = 0.0
+        self.host_rtt_ms: Optional[float] = None
+        self.players: dict[str, dict] = {}  # player_id -> {name, score, ws, connected, last_seen, rtt_ms}
+        self.heartbeat_task: Optional[asyncio.Task] = None
         self.current_question: Optional[dict] = None
         self.question_active = False
-        self.answer_submissions: dict[str, dict] = {}  # player_id -> {answer, timestamp, position}
+        self.question_started_at: Optional[float] = None
+        self.answer_submissions: dict[str, dict] = {}  # player_id -> {answer, timestamp, position, is_correct}
         self.submission_order: list[str] = []  # ordered list of player_ids by submission time
+        # Running aggregates, updated in O(1) per submission
+        self.answer_counts: dict[str, int] = {}  # option letter -> submissions
+        self.correct_count = 0
+        self.first_correct: Optional[str] = None  # earliest-received correct player_id
+        self.distribution_task: Optional[asyncio.Task] = None
+        self._correct_letter_for: Optional[dict] = None
+        self._correct_letter: Optional[str] = None
         self.timer_seconds = 15
         self.timer_task: Optional[asyncio.Task] = None
         self.current_category: Optional[str] = None
-        self.questions_data = load_questions()
+        # Questions are fetched from the shared store on demand, never copied per room
+        self.question_store = get_question_store()
         self.used_questions: set[str] = set()
         # Mini-game state (boat race)
         self.mini_game_positions: dict[str, float] = {}  # player_id -> position (0-100)
         self.mini_game_finished: list[str] = []  # player_ids who finished, in order
         self.mini_game_tide_task: Optional[asyncio.Task] = None
         self.mini_game_active = True  # Active until first question starts
+        # Optional per-frame latency tracing
+        self.tracer = tracing.RoomTracer()
+        self.room_code = room_id[:6].upper()
+        # Read-only displays get their own throttled fan-out
+        self.spectators = SpectatorHub()
+        self.expiry_task: Optional[asyncio.Task] = None
+        # Upcoming questions queued by the host, with their start frames pre-encoded
+        self.question_queue: deque[dict] = deque()
+        self.auto_advance = False
+        self.auto_advance_pause = AUTO_ADVANCE_PAUSE
+        self.advance_task: Optional[asyncio.Task] = None
+        self.tournament: Optional[Tournament] = None
+
+    def get_correct_letter(self) -> Optional[str]:
+        """Letter of the current question's correct option, worked out once per question"""
+        if self.current_question is not self._correct_letter_for:
+            options = self.current_question.get("options", []) if self.current_question else []
+            correct_answer = self.current_question.get("correct_answer") if self.current_question else None
+            self._correct_letter = next(
+                (chr(65 + i) for i, opt in enumerate(options) if opt == correct_answer), None
+            )
+            self._correct_letter_for = self.current_question
+        return self._correct_letter
+
+    def is_valid_answer(self, answer) -> bool:
+        """Whether answer is one of the current question's option letters"""
+        if not isinstance(answer, str) or len(answer) != 1:
+            return False
+        options = self.current_question.get("options") if self.current_question else None
+        # Questions without an options list use the standard four buttons
+        return "A" <= answer < chr(65 + (len(options) if options else 4))
+
+    def reset_answers(self):
+        """Clear submissions and their aggregates for a new (or no) question"""
+        self.answer_submissions = {}
+        self.submission_order = []
+        self.answer_counts = {}
+        self.correct_count = 0
+        self.first_correct = None
+        if self.distribution_task:
+            self.distribution_task.cancel()
+            self.distribution_task = None
+
+    def record_submission(self, player_id: str, answer) -> int:
+        """Record a submission with its position and update the aggregates"""
+        position = len(self.submission_order) + 1
+        is_correct = answer == self.get_correct_letter()
+        self.answer_submissions[player_id] = {
+            "answer": answer,
+            "timestamp": datetime.now().isoformat(),
+            "position": position,
+            "is_correct": is_correct
+        }
+        self.submission_order.append(player_id)
+
+        self.answer_counts[answer] = self.answer_counts.get(answer, 0) + 1
+        if is_correct:
+            self.correct_count += 1
+            if self.first_correct is None:
+                self.first_correct = player_id
+        return position
+
+    def get_answer_distribution(self) -> dict:
+        options = self.current_question.get("options", []) if self.current_question else []
+        return {
+            "counts": {chr(65 + i): self.answer_counts.get(chr(65 + i), 0) for i in range(len(options))},
+            "total": len(self.answer_submissions),
+            "correct_count": self.correct_count,
+            "first_correct": self.first_correct
+        }
+
+    def schedule_answer_distribution(self):
+        """Coalesce submissions into at most one answer_distribution frame per interval"""
+        if not self.distribution_task:
+            self.distribution_task = asyncio.create_task(self._send_answer_distribution())
+
+    async def _send_answer_distribution(self):
+        await asyncio.sleep(ANSWER_DISTRIBUTION_INTERVAL)
+        self.distribution_task = None
+        await self.send_to_host({
+            "type": "answer_distribution",
+            **self.get_answer_distribution()
+        })
 
     def get_leaderboard(self):
         sorted_players = sorted(
@@ -69,44 +241,224 @@ class GameRoom:
             player["position"] = i + 1
         return sorted_players
 
+    async def _send(self, ws: WebSocket, role: str, message: dict, player_id: Optional[str] = None) -> bool:
+        """Send a message on one socket, recording traffic and dropping it if the send fails"""
+        msg_type = message.get("type")
+        try:
+            await ws.send_json(message)
+        except Exception:
+            self._send_failed(ws, role, msg_type, player_id)
+            if "seq" in message:
+                self.tracer.abandon(message["seq"], player_id)
+            return False
+        metrics.messages_out.inc(role, msg_type)
+        return True
+
+    async def _send_text(self, ws: WebSocket, role: str, msg_type: str, text: str,
+                         player_id: Optional[str] = None) -> bool:
+        """Send a frame that was JSON-encoded ahead of time"""
+        try:
+            await ws.send_text(text)
+        except Exception:
+            self._send_failed(ws, role, msg_type, player_id)
+            return False
+        metrics.messages_out.inc(role, msg_type)
+        return True
+
+    def _send_failed(self, ws: WebSocket, role: str, msg_type: str, player_id: Optional[str]):
+        metrics.send_failures.inc(role, msg_type)
+        if player_id:
+            self.drop_player(player_id, ws)
+        elif ws is self.host_ws:
+            self.drop_host()
+
+    def publish(self, message: dict):
+        """Hand an outgoing room message to spectators and the tournament board"""
+        self.spectators.publish(message)
+        if self.tournament and "leaderboard" in message:
+            self.tournament.sync_room(self.room_id, message["leaderboard"])
+
+    def connected_recipients(self, include_host: bool = False) -> list[Optional[str]]:
+        """Player ids a broadcast is about to reach, plus None for the host"""
+        recipients: list[Optional[str]] = [None] if include_host and self.host_ws else []
+        recipients.extend(pid for pid, player in self.players.items() if player["ws"] and player["connected"])
+        return recipients
+
     async def broadcast_to_all(self, message: dict):
         """Send message to host and all players"""
+        started = time.perf_counter()
+        self.publish(message)
+        if self.tracer.enabled:
+            message = self.tracer.stamp(message, self.connected_recipients(include_host=True))
         if self.host_ws:
-            try:
-                await self.host_ws.send_json(message)
-            except:
-                pass
-        for player in self.players.values():
+            await self._send(self.host_ws, "host", message)
+        for player_id, player in list(self.players.items()):
             if player["ws"] and player["connected"]:
-                try:
-                    await player["ws"].send_json(message)
-                except:
-                    pass
+                await self._send(player["ws"], "player", message, player_id)
+        elapsed = time.perf_counter() - started
+        metrics.broadcast_seconds.observe("all", message.get("type"), value=elapsed)
+        profiler.report("broadcast", self.room_id, message.get("type"), elapsed)
 
     async def broadcast_to_players(self, message: dict):
         """Send message to all players only"""
-        for player in self.players.values():
+        started = time.perf_counter()
+        self.publish(message)
+        if self.tracer.enabled:
+            message = self.tracer.stamp(message, self.connected_recipients())
+        for player_id, player in list(self.players.items()):
             if player["ws"] and player["connected"]:
-                try:
-                    await player["ws"].send_json(message)
-                except:
-                    pass
+                await self._send(player["ws"], "player", message, player_id)
+        elapsed = time.perf_counter() - started
+        metrics.broadcast_seconds.observe("players", message.get("type"), value=elapsed)
+        profiler.report("broadcast", self.room_id, message.get("type"), elapsed)
 
     async def send_to_host(self, message: dict):
         """Send message to host only"""
+        self.publish(message)
         if self.host_ws:
-            try:
-                await self.host_ws.send_json(message)
-            except:
-                pass
+            await self._send(self.host_ws, "host", self.tracer.stamp(message, [None]))
+
+    async def send_encoded(self, host_frame: tuple[dict, str], player_frame: tuple[dict, str]):
+        """Send pre-encoded (message, json) frames to the host and players"""
+        if self.tracer.enabled:
+            # Traced frames are stamped per send, so they can't be encoded in advance
+            await self.send_to_host(host_frame[0])
+            await self.broadcast_to_players(player_frame[0])
+            return
+        started = time.perf_counter()
+        await self.send_encoded_to_host(*host_frame)
+        message, text = player_frame
+        self.publish(message)
+        for player_id, player in list(self.players.items()):
+            if player["ws"] and player["connected"]:
+                await self._send_text(player["ws"], "player", message["type"], text, player_id)
+        elapsed = time.perf_counter() - started
+        metrics.broadcast_seconds.observe("all", message["type"], value=elapsed)
+        profiler.report("broadcast", self.room_id, message["type"], elapsed)
+
+    async def send_encoded_to_host(self, message: dict, text: str):
+        """Send the host a frame encoded once for many recipients"""
+        if self.tracer.enabled:
+            await self.send_to_host(message)
+            return
+        self.publish(message)
+        if self.host_ws:
+            await self._send_text(self.host_ws, "host", message["type"], text)
 
     async def send_to_player(self, player_id: str, message: dict):
         """Send message to specific player"""
         if player_id in self.players and self.players[player_id]["ws"]:
-            try:
-                await self.players[player_id]["ws"].send_json(message)
-            except:
-                pass
+            await self._send(self.players[player_id]["ws"], "player", self.tracer.stamp(message, [player_id]), player_id)
+
+    def drop_player(self, player_id: str, ws: WebSocket):
+        """Mark a dead player socket disconnected right away so fan-out skips it"""
+        player = self.players.get(player_id)
+        if not player or player["ws"] is not ws:
+            return  # Already dropped, or the player has reconnected on a new socket
+        player["ws"] = None
+        player["connected"] = False
+        metrics.dropped_connections.inc("player")
+        asyncio.create_task(close_quietly(ws))
+        asyncio.create_task(self.send_to_host({
+            "type": "player_disconnected",
+            "player_id": player_id,
+            "name": player["name"],
+            "leaderboard": self.get_leaderboard()
+        }))
+        schedule_room_expiry(self)
+
+    def drop_host(self):
+        ws, self.host_ws = self.host_ws, None
+        if ws:
+            metrics.dropped_connections.inc("host")
+            asyncio.create_task(close_quietly(ws))
+            schedule_room_expiry(self)
+
+    def touch(self, player_id: Optional[str] = None):
+        """Any inbound frame proves the connection is alive"""
+        if player_id is None:
+            self.host_last_seen = time.monotonic()
+        elif player_id in self.players:
+            self.players[player_id]["last_seen"] = time.monotonic()
+
+    def record_pong(self, player_id: Optional[str], data: dict):
+        sent = data.get("t")
+        if not isinstance(sent, (int, float)):
+            return
+        rtt_ms = tracing.now_ms() - sent
+        if player_id is None:
+            self.host_rtt_ms = rtt_ms
+        elif player_id in self.players:
+            self.players[player_id]["rtt_ms"] = rtt_ms
+        metrics.heartbeat_rtt_seconds.observe("host" if player_id is None else "player", value=rtt_ms / 1000)
+
+    def start_heartbeat(self):
+        if HEARTBEAT_INTERVAL > 0 and (self.heartbeat_task is None or self.heartbeat_task.done()):
+            self.heartbeat_task = asyncio.create_task(self.run_heartbeat())
+
+    async def run_heartbeat(self):
+        """Ping every connection and reap the ones that have gone quiet"""
+        tracing.current_cause.set(None)
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            deadline = time.monotonic() - HEARTBEAT_TIMEOUT
+            ping = {"type": "ping", "t": tracing.now_ms()}
+            if self.host_ws:
+                if self.host_last_seen < deadline:
+                    self.drop_host()
+                else:
+                    await self._send(self.host_ws, "host", ping)
+            for player_id, player in list(self.players.items()):
+                if not (player["ws"] and player["connected"]):
+                    continue
+                if player.get("last_seen", 0) < deadline:
+                    self.drop_player(player_id, player["ws"])
+                else:
+                    await self._send(player["ws"], "player", ping, player_id)
+
+    def prepare_question(self, question: dict) -> dict:
+        """Build and encode a question's question_started frames ahead of time"""
+        host_message = {"type": "question_started", "question": question, "timer": self.timer_seconds}
+        player_message = {"type": "question_started", "timer": self.timer_seconds}
+        return {
+            "question": question,
+            "timer": self.timer_seconds,
+            "host_frame": (host_message, json.dumps(host_message)),
+            "player_frame": (player_message, json.dumps(player_message))
+        }
+
+    def reencode_queue(self):
+        """Refresh queued frames after the timer length changes"""
+        self.question_queue = deque(self.prepare_question(entry["question"]) for entry in self.question_queue)
+
+    def take_queued(self, question_id: Optional[str] = None) -> Optional[dict]:
+        """Remove and return the next queued question, or the queued one with this id"""
+        if question_id is None:
+            return self.question_queue.popleft() if self.question_queue else None
+        for entry in self.question_queue:
+            if entry["question"].get("id") == question_id:
+                self.question_queue.remove(entry)
+                return entry
+        return None
+
+    def get_queue_state(self) -> dict:
+        return {
+            "queue": [entry["question"].get("id") for entry in self.question_queue],
+            "auto_advance": self.auto_advance,
+            "pause_seconds": self.auto_advance_pause
+        }
+
+    def cancel_auto_advance(self):
+        if self.advance_task:
+            self.advance_task.cancel()
+            self.advance_task = None
+
+    def get_spectator_snapshot(self) -> dict:
+        """Current state a newly connected spectator starts from"""
+        snapshot = {"leaderboard": {"type": "leaderboard_update", "leaderboard": self.get_leaderboard()}}
+        if self.mini_game_active:
+            snapshot["mini_game"] = {"type": "mini_game_update", **self.get_mini_game_state()}
+        return snapshot
 
     def get_mini_game_state(self):
         """Get current mini-game state for broadcasting"""
@@ -136,7 +488,9 @@ class GameRoom:
     async def start_mini_game_tide(self):
         """Run the tide that pulls boats back"""
         while self.mini_game_active:
+            tick_started = time.perf_counter()
             await asyncio.sleep(0.5)
+            metrics.observe_tick("tide", 0.5, tick_started)
             if not self.mini_game_active:
                 break
             # Apply tide to all non-finished players (1.5 per tick = 3 per second)
@@ -172,6 +526,7 @@ class GameRoom:
             # Award bonus points for first 2 finishers
             if finish_position <= 2:
                 self.players[player_id]["score"] += 50
+                history.sink.record(self.room_id, "score_changed", player_id=player_id, points=50, source="mini_game")
                 # Send points notification to player
                 await self.send_to_player(player_id, {
                     "type": "mini_game_bonus",
@@ -200,10 +555,111 @@ class GameRoom:
 
 # Store all active rooms
 rooms: dict[str, GameRoom] = {}
+tournaments: dict[str, Tournament] = {}
+
+# Rooms nobody is connected to are closed after this long and their code reused
+ROOM_IDLE_TIMEOUT = float(os.getenv("ROOM_IDLE_MINUTES", "60")) * 60
+
+# Short codes avoid characters that are easy to misread (0/O, 1/I)
+ROOM_CODE_ALPHABET = "".join(c for c in string.ascii_uppercase + string.digits if c not in "01IO")
+ROOM_CODE_LENGTH = 6
+
+
+class RoomCodeRegistry:
+    """Short join code -> room id, with collision-free allocation"""
+
+    def __init__(self):
+        self.codes: dict[str, str] = {}
+
+    def allocate(self, room_id: str) -> str:
+        # Prefer the historical UUID prefix so existing links keep working
+        code = room_id[:ROOM_CODE_LENGTH].upper()
+        while code in self.codes:
+            code = "".join(secrets.choice(ROOM_CODE_ALPHABET) for _ in range(ROOM_CODE_LENGTH))
+        self.codes[code] = room_id
+        return code
+
+    def release(self, code: str, room_id: str):
+        if self.codes.get(code) == room_id:
+            del self.codes[code]
+
+    def lookup(self, code: str) -> Optional[str]:
+        return self.codes.get(code.upper())
+
+
+room_codes = RoomCodeRegistry()
+
+
+def resolve_room(room_key: str) -> Optional[GameRoom]:
+    """Find a room by its full id or its short join code"""
+    room = rooms.get(room_key)
+    if room is None and len(room_key) == ROOM_CODE_LENGTH:
+        room = rooms.get(room_codes.lookup(room_key))
+    return room
+
+
+def close_room(room: GameRoom):
+    """Drop a dead room and reclaim its join code"""
+    room.stop_mini_game()
+    room.reset_answers()
+    if room.timer_task:
+        room.timer_task.cancel()
+    cancel_room_expiry(room)
+    room.cancel_auto_advance()
+    if room.tournament:
+        # Finished tables keep their place in the standings
+        room.tournament.detach_room(room)
+    room.spectators.close()
+    if room.heartbeat_task:
+        room.heartbeat_task.cancel()
+    rooms.pop(room.room_id, None)
+    room_codes.release(room.room_code, room.room_id)
+
+
+def schedule_room_expiry(room: GameRoom):
+    """Start the idle countdown once nobody is connected to the room"""
+    if room.host_ws or any(p["connected"] for p in room.players.values()):
+        return
+    if room.expiry_task is None:
+        room.expiry_task = asyncio.create_task(_expire_room(room))
+
+
+def cancel_room_expiry(room: GameRoom):
+    if room.expiry_task:
+        room.expiry_task.cancel()
+        room.expiry_task = None
+
+
+async def _expire_room(room: GameRoom):
+    await asyncio.sleep(ROOM_IDLE_TIMEOUT)
+    room.expiry_task = None
+    close_room(room)
+
+
+def _player_counts():
+    connected = sum(1 for room in rooms.values() for p in room.players.values() if p["connected"])
+    total = sum(len(room.players) for room in rooms.values())
+    return {("connected",): connected, ("disconnected",): total - connected}
+
+
+def _socket_counts():
+    hosts = sum(1 for room in rooms.values() if room.host_ws)
+    players = sum(1 for room in rooms.values() for p in room.players.values() if p["ws"] and p["connected"])
+    spectators = sum(len(room.spectators.feeds) for room in rooms.values())
+    return {("host",): hosts, ("player",): players, ("spectator",): spectators}
+
+
+# Room gauges are computed on scrape so the game loop pays nothing for them
+metrics.registry.extend([
+    metrics.Gauge("quiznight_rooms", "Active game rooms", callback=lambda: len(rooms)),
+    metrics.Gauge("quiznight_players", "Players across all rooms", ("state",), callback=_player_counts),
+    metrics.Gauge("quiznight_open_sockets", "Open WebSocket connections", ("role",), callback=_socket_counts),
+])
 
 
 class CreateRoomRequest(BaseModel):
     host_name: str
+    tournament_id: Optional[str] = None
 
 
 class CreateRoomResponse(BaseModel):
@@ -211,57 +667,337 @@ class CreateRoomResponse(BaseModel):
     room_code: str
 
 
+class ProfilingRequest(BaseModel):
+    enabled: bool
+    slow_ms: Optional[float] = None
+
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin access denied")
+
+
 @app.get("/")
 async def root():
     return {"status": "Quiz Night API is running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling():
+    """Current profiling settings"""
+    return profiler.status()
+
+
+@app.post("/api/admin/profiling", dependencies=[Depends(require_admin)])
+async def set_profiling(request: ProfilingRequest):
+    """Turn slow-handler and loop-lag logging on or off without restarting"""
+    profiler.configure(request.enabled, request.slow_ms)
+    return profiler.status()
+
+
+@app.get("/api/admin/profiling/flamegraph", dependencies=[Depends(require_admin)])
+async def get_flamegraph(seconds: float = Query(10, gt=0, le=120)):
+    """Sample the message handlers for a window and return folded stacks"""
+    try:
+        folded = await profiler.sample_stacks(seconds)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(folded)
+
+
+@app.get("/api/admin/startup", dependencies=[Depends(require_admin)])
+async def get_startup_report():
+    """Cold-start time breakdown for this process"""
+    return startup.report()
+
+
+@app.get("/api/admin/history", dependencies=[Depends(require_admin)])
+async def export_all_history():
+    """Stream every recorded game as NDJSON, for the offline aggregator"""
+    if not history.sink.enabled:
+        raise HTTPException(status_code=404, detail="History recording is disabled")
+    await history.sink.flush()
+    return StreamingResponse(history.stream_files(history.sink.room_files()), media_type="application/x-ndjson")
+
+
 @app.get("/api/questions")
 async def get_questions():
     """Get all questions for editing"""
-    return load_questions()
+    # Encoded once per catalog version in a worker thread; a changed file is re-read there too
+    content = await asyncio.to_thread(get_question_store().encoded)
+    return Response(content=content, media_type="application/json")
+
+
+@app.get("/api/questions/categories")
+async def get_question_categories():
+    """Category names with question counts"""
+    return get_question_store().categories()
+
+
+@app.get("/api/questions/categories/{category}")
+async def get_category_questions(category: str, offset: int = Query(0, ge=0), limit: int = Query(100, gt=0, le=500)):
+    """One page of a category's questions"""
+    return get_question_store().questions(category, offset, limit)
+
+
+@app.get("/api/questions/search")
+async def search_questions(q: str, category: Optional[str] = None, limit: int = Query(20, gt=0, le=100)):
+    """Full-text search over question text and options"""
+    return get_question_store().search(q, category, limit)
+
+
+@app.get("/api/questions/{question_id}")
+async def get_question(question_id: str):
+    question = get_question_store().get(question_id)
+    if question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+    return question
+
+
+@app.api_route("/media/{path:path}", methods=["GET", "HEAD"])
+async def get_media(path: str, request: Request, v: Optional[str] = None):
+    """Question media with range requests and long-lived caching"""
+    return await media.media_response(path, request.headers, v, send_body=request.method == "GET")
+
+
+@app.get("/api/media/manifest")
+async def get_media_manifest(category: Optional[str] = None):
+    """Audio to prefetch per category, with versioned URLs, sizes and ETags"""
+    store = get_question_store()
+    categories = [c for c in store.categories() if category is None or c["name"] == category]
+    if category is not None and not categories:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return {
+        c["name"]: await media.prefetch_manifest(store.questions(c["name"], 0, c["count"]))
+        for c in categories
+    }
 
 
 @app.post("/api/rooms")
 async def create_room(request: CreateRoomRequest):
     """Create a new game room"""
+    tournament = None
+    if request.tournament_id:
+        tournament = tournaments.get(request.tournament_id)
+        if tournament is None:
+            raise HTTPException(status_code=404, detail="Tournament not found")
     room_id = str(uuid.uuid4())
-    room_code = room_id[:6].upper()
-    rooms[room_id] = GameRoom(room_id, request.host_name)
-    return {"room_id": room_id, "room_code": room_code}
+    room = GameRoom(room_id, request.host_name)
+    room.room_code = room_codes.allocate(room_id)
+    rooms[room_id] = room
+    if tournament:
+        tournament.add_room(room)
+    # A room that nobody ever joins still expires
+    schedule_room_expiry(room)
+    startup.milestone("first room")
+    return {"room_id": room_id, "room_code": room.room_code}
 
 
 @app.get("/api/rooms/{room_id}")
 async def get_room(room_id: str):
-    """Check if room exists"""
-    if room_id not in rooms:
+    """Check if room exists (accepts the full id or the short code)"""
+    room = resolve_room(room_id)
+    if room is None:
         raise HTTPException(status_code=404, detail="Room not found")
-    room = rooms[room_id]
     return {
-        "room_id": room_id,
+        "room_id": room.room_id,
+        "room_code": room.room_code,
         "host_name": room.host_name,
         "player_count": len(room.players)
     }
 
 
+@app.get("/api/rooms/{room_id}/latency")
+async def get_room_latency(room_id: str):
+    """Traced delivery and end-to-end latency distributions for a room"""
+    room = resolve_room(room_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    delivery = room.tracer.recipient_summary()
+    recipients = [{"player_id": None, "name": room.host_name, "rtt_ms": room.host_rtt_ms,
+                   "delivery": delivery.get(None)}]
+    recipients.extend(
+        {"player_id": player_id, "name": player["name"], "rtt_ms": player.get("rtt_ms"),
+         "delivery": delivery.get(player_id)}
+        for player_id, player in room.players.items()
+    )
+    # Slowest recipients first
+    recipients.sort(key=lambda r: -(r["delivery"] or {}).get("p90_ms", -1))
+    return {
+        "room_id": room.room_id,
+        "tracing": room.tracer.enabled,
+        "latency": room.tracer.summary(),
+        "recipients": recipients
+    }
+
+
+@app.get("/api/rooms/{room_id}/history", dependencies=[Depends(require_admin)])
+async def export_room_history(room_id: str):
+    """Stream a room's recorded game history as NDJSON"""
+    # Admin only: it includes every answer and its correctness, even for the open question.
+    # Full room ids only: history outlives the room, and short codes get reused
+    path = history.sink.path_for(room_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="History not found")
+    await history.sink.flush()
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="History not found")
+    return StreamingResponse(history.stream_files([path]), media_type="application/x-ndjson")
+
+
+class CreateTournamentRequest(BaseModel):
+    name: str
+
+
+class TournamentRoomRequest(BaseModel):
+    room_id: str
+
+
+@app.post("/api/tournaments")
+async def create_tournament(request: CreateTournamentRequest):
+    """Create a tournament that rooms can join for a combined leaderboard"""
+    tournament_id = str(uuid.uuid4())
+    tournaments[tournament_id] = Tournament(tournament_id, request.name)
+    return {"tournament_id": tournament_id, "name": request.name}
+
+
+def get_tournament_or_404(tournament_id: str) -> Tournament:
+    tournament = tournaments.get(tournament_id)
+    if tournament is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournament
+
+
+@app.get("/api/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str, limit: int = Query(100, gt=0, le=1000)):
+    """Global standings across every room in the tournament"""
+    tournament = get_tournament_or_404(tournament_id)
+    return {
+        "tournament_id": tournament.tournament_id,
+        "name": tournament.name,
+        "rooms": [{"room_id": room_id, "room_code": code} for room_id, code in tournament.room_codes.items()],
+        "total_players": len(tournament.ranking),
+        "standings": tournament.get_standings(limit)
+    }
+
+
+@app.post("/api/tournaments/{tournament_id}/rooms")
+async def add_tournament_room(tournament_id: str, request: TournamentRoomRequest):
+    """Enter an existing room (full id or short code) into a tournament"""
+    tournament = get_tournament_or_404(tournament_id)
+    room = resolve_room(request.room_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    if room.tournament and room.tournament is not tournament:
+        raise HTTPException(status_code=409, detail="Room is already in another tournament")
+    tournament.add_room(room)
+    return {"tournament_id": tournament_id, "room_id": room.room_id, "room_code": room.room_code}
+
+
+@app.delete("/api/tournaments/{tournament_id}/rooms/{room_id}")
+async def remove_tournament_room(tournament_id: str, room_id: str):
+    """Withdraw a room and its players from a tournament"""
+    tournament = get_tournament_or_404(tournament_id)
+    # Closed rooms can still be withdrawn by their full id
+    room = resolve_room(room_id)
+    room_id = room.room_id if room else room_id
+    if room_id not in tournament.room_codes:
+        raise HTTPException(status_code=404, detail="Room not in tournament")
+    tournament.remove_room(room_id)
+    return {"tournament_id": tournament_id, "room_id": room_id}
+
+
+@app.get("/api/rooms/{room_id}/spectate")
+async def spectate_events(room_id: str):
+    """Server-Sent Events version of the spectator feed"""
+    room = resolve_room(room_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+
+    async def stream():
+        feed = room.spectators.subscribe(room.get_spectator_snapshot())
+        try:
+            while not feed.closed:
+                frames = await feed.next(timeout=15)
+                if not frames:
+                    yield ": keepalive\n\n"
+                for event, data in frames:
+                    yield f"event: {event}\ndata: {data}\n\n"
+        finally:
+            room.spectators.unsubscribe(feed)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/ws/spectate/{room_id}")
+async def spectator_websocket(websocket: WebSocket, room_id: str):
+    """Read-only, throttled feed of leaderboard, timer and boat-race frames"""
+    room = resolve_room(room_id)
+    if room is None:
+        await websocket.close(code=4004, reason="Room not found")
+        return
+
+    await websocket.accept()
+    feed = room.spectators.subscribe(room.get_spectator_snapshot())
+
+    async def drain_incoming():
+        # Spectators can't send anything; reading just notices when they leave
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            print(f"Spectator WebSocket error: {e}")
+        finally:
+            feed.close()
+
+    reader = asyncio.create_task(drain_incoming())
+    try:
+        while not feed.closed:
+            for event, data in await feed.next():
+                try:
+                    await websocket.send_text(data)
+                except Exception:
+                    metrics.send_failures.inc("spectator", event)
+                    feed.close()
+                    break
+    finally:
+        reader.cancel()
+        room.spectators.unsubscribe(feed)
+
+
 @app.websocket("/ws/host/{room_id}")
 async def host_websocket(websocket: WebSocket, room_id: str):
     """WebSocket connection for the host"""
-    if room_id not in rooms:
+    room = resolve_room(room_id)
+    if room is None:
         await websocket.close(code=4004, reason="Room not found")
         return
 
     await websocket.accept()
-    room = rooms[room_id]
     room.host_ws = websocket
+    room.touch()
+    cancel_room_expiry(room)
+    room.start_heartbeat()
 
     # Send initial state
     await websocket.send_json({
         "type": "init",
-        "room_id": room_id,
-        "room_code": room_id[:6].upper(),
+        "room_id": room.room_id,
+        "room_code": room.room_code,
         "players": room.get_leaderboard(),
-        "categories": list(room.questions_data.get("categories", {}).keys()),
+        "categories": [category["name"] for category in room.question_store.categories()],
         "timer_seconds": room.timer_seconds,
         "mini_game": room.get_mini_game_state(),
         "mini_game_active": room.mini_game_active
@@ -270,12 +1006,41 @@ async def host_websocket(websocket: WebSocket, room_id: str):
     try:
         while True:
             data = await websocket.receive_json()
-            await handle_host_message(room, data)
+            await dispatch_message(room, "host", data, lambda: handle_host_message(room, data))
     except WebSocketDisconnect:
-        room.host_ws = None
+        pass
     except Exception as e:
         print(f"Host WebSocket error: {e}")
+    # Leave a newer host connection alone if this one was superseded
+    if room.host_ws is websocket:
         room.host_ws = None
+    schedule_room_expiry(room)
+
+
+async def dispatch_message(room: GameRoom, role: str, data: dict, handle, player_id: Optional[str] = None):
+    """Bookkeeping shared by every inbound frame before it reaches its handler"""
+    received = tracing.now_ms()
+    msg_type = data.get("type")
+    metrics.messages_in.inc(role, msg_type)
+    room.touch(player_id)
+
+    # Trace acks and heartbeat pongs are consumed here rather than by the game handlers
+    if msg_type == "ack":
+        room.tracer.record_ack(data, role, player_id)
+        return
+    if msg_type == "pong":
+        room.record_pong(player_id, data)
+        return
+
+    cause = None
+    if room.tracer.enabled:
+        cause = tracing.current_cause.set((data.get("trace_id") or tracing.new_trace_id(), received))
+    try:
+        with profiler.track(f"{role}_message", room.room_id, msg_type):
+            await handle()
+    finally:
+        if cause:
+            tracing.current_cause.reset(cause)
 
 
 async def handle_host_message(room: GameRoom, data: dict):
@@ -291,40 +1056,23 @@ async def handle_host_message(room: GameRoom, data: dict):
 
     elif msg_type == "start_question":
         question_data = data.get("question")
+        question_id = data.get("question_id") or (question_data.get("id") if question_data else None)
+        # A queued question starts from its pre-encoded frames; an empty trigger takes the next one
+        dequeued = room.take_queued(question_id) if question_id or not question_data else None
+        # A full question from the host wins over the queued copy, which is still dropped
+        prepared = None if question_data else dequeued
+        if prepared:
+            question_data = prepared["question"]
+        elif not question_data and question_id:
+            question_data = room.question_store.get(question_id)
         if question_data:
-            # Stop mini-game when first question starts
-            if room.mini_game_active:
-                room.stop_mini_game()
-                await room.broadcast_to_all({
-                    "type": "mini_game_ended",
-                    "winners": room.mini_game_finished[:2]
+            await begin_question(room, question_data, prepared)
+            if dequeued:
+                await room.send_to_host({
+                    "type": "question_queue_updated",
+                    **room.get_queue_state()
                 })
 
-            room.current_question = question_data
-            room.question_active = True
-            room.answer_submissions = {}
-            room.submission_order = []
-
-            # Notify host with full question
-            await room.send_to_host({
-                "type": "question_started",
-                "question": question_data,
-                "timer": room.timer_seconds
-            })
-
-            # Notify players that question started (they look at host screen for question)
-            await room.broadcast_to_players({
-                "type": "question_started",
-                "timer": room.timer_seconds
-            })
-
-            # Start timer (skip for music questions - host controls playback)
-            is_music_question = question_data.get("type") == "music"
-            if not is_music_question:
-                if room.timer_task:
-                    room.timer_task.cancel()
-                room.timer_task = asyncio.create_task(run_timer(room))
-
     elif msg_type == "stop_question":
         room.question_active = False
         if room.timer_task:
@@ -336,17 +1084,14 @@ async def handle_host_message(room: GameRoom, data: dict):
 
     elif msg_type == "reveal_answer":
         if room.current_question:
+            room.cancel_auto_advance()
+            if room.distribution_task:
+                room.distribution_task.cancel()
+                room.distribution_task = None
+
             correct_answer = room.current_question.get("correct_answer")
-            options = room.current_question.get("options", [])
             base_points = room.current_question.get("points", 100)
-
-            # Find correct answer index (A, B, C, D)
-            correct_index = -1
-            for i, opt in enumerate(options):
-                if opt == correct_answer:
-                    correct_index = i
-                    break
-            correct_letter = chr(65 + correct_index) if correct_index >= 0 else None
+            correct_letter = room.get_correct_letter()
 
             # Position-based multipliers
             multipliers = [1.0, 0.75, 0.5, 0.25]
@@ -363,7 +1108,8 @@ async def handle_host_message(room: GameRoom, data: dict):
                 multiplier = multipliers[min(position - 1, 3)]
                 answer = submission["answer"]
 
-                is_correct = answer == correct_letter
+                # Correctness was settled when the answer came in
+                is_correct = submission["is_correct"]
 
                 if is_correct:
                     points = int(base_points * multiplier)
@@ -404,20 +1150,34 @@ async def handle_host_message(room: GameRoom, data: dict):
                 room.timer_task.cancel()
                 room.timer_task = None
 
+            auto_advancing = room.auto_advance and bool(room.question_queue)
+
             # Broadcast comprehensive results to all
             await room.broadcast_to_all({
                 "type": "answer_revealed",
                 "correct_answer": correct_answer,
                 "correct_letter": correct_letter,
                 "scoring_results": scoring_results,
-                "leaderboard": room.get_leaderboard()
+                "answer_distribution": room.get_answer_distribution(),
+                "leaderboard": room.get_leaderboard(),
+                "next_question_in": room.auto_advance_pause if auto_advancing else None
             })
+            history.sink.record(
+                room.room_id, "answer_revealed",
+                question_id=room.current_question.get("id"),
+                correct_letter=correct_letter,
+                distribution=room.get_answer_distribution(),
+                results=scoring_results
+            )
+            if auto_advancing:
+                schedule_auto_advance(room)
 
     elif msg_type == "award_points":
         player_id = data.get("player_id")
         points = data.get("points", 0)
         if player_id in room.players:
             room.players[player_id]["score"] += points
+            history.sink.record(room.room_id, "score_changed", player_id=player_id, points=points, source="award")
             leaderboard = room.get_leaderboard()
 
             # Broadcast updated leaderboard to all
@@ -433,24 +1193,48 @@ async def handle_host_message(room: GameRoom, data: dict):
         new_score = data.get("score", 0)
         if player_id in room.players:
             room.players[player_id]["score"] = new_score
+            history.sink.record(room.room_id, "score_changed", player_id=player_id, score=new_score, source="adjust")
             leaderboard = room.get_leaderboard()
             await room.broadcast_to_all({
                 "type": "leaderboard_update",
                 "leaderboard": leaderboard
             })
 
+    elif msg_type == "set_tracing":
+        room.tracer.enabled = bool(data.get("enabled"))
+        await room.send_to_host({
+            "type": "tracing_updated",
+            "enabled": room.tracer.enabled
+        })
+
     elif msg_type == "set_timer":
         room.timer_seconds = data.get("seconds", 15)
+        room.reencode_queue()
         await room.send_to_host({
             "type": "timer_updated",
             "seconds": room.timer_seconds
         })
 
+    elif msg_type == "queue_questions":
+        await handle_queue_questions(room, data)
+
+    elif msg_type == "set_auto_advance":
+        room.auto_advance = bool(data.get("enabled"))
+        pause = data.get("pause_seconds")
+        if isinstance(pause, (int, float)) and 0 <= pause <= 300:
+            room.auto_advance_pause = pause
+        if not room.auto_advance:
+            room.cancel_auto_advance()
+        await room.send_to_host({
+            "type": "question_queue_updated",
+            **room.get_queue_state()
+        })
+
     elif msg_type == "next_question":
+        room.cancel_auto_advance()
         room.current_question = None
         room.question_active = False
-        room.answer_submissions = {}
-        room.submission_order = []
+        room.reset_answers()
         await room.broadcast_to_all({
             "type": "question_cleared"
         })
@@ -468,10 +1252,7 @@ async def handle_host_message(room: GameRoom, data: dict):
         if player_id in room.players:
             await room.send_to_player(player_id, {"type": "kicked"})
             if room.players[player_id]["ws"]:
-                try:
-                    await room.players[player_id]["ws"].close()
-                except:
-                    pass
+                await close_quietly(room.players[player_id]["ws"])
             del room.players[player_id]
             await room.broadcast_to_all({
                 "type": "player_left",
@@ -479,9 +1260,181 @@ async def handle_host_message(room: GameRoom, data: dict):
                 "leaderboard": room.get_leaderboard()
             })
 
+    elif msg_type == "batch":
+        await handle_host_batch(room, data.get("operations"))
+
+
+BATCH_OPERATIONS = {"award_points", "adjust_score", "kick_player", "set_timer"}
+
+
+def validate_batch(room: GameRoom, operations) -> list[str]:
+    """Check every operation up front so a batch is applied all-or-nothing"""
+    if not isinstance(operations, list) or not operations:
+        return ["operations must be a non-empty list"]
+    errors = []
+    kicked = set()
+    for i, op in enumerate(operations):
+        op_type = op.get("type") if isinstance(op, dict) else None
+        if op_type not in BATCH_OPERATIONS:
+            errors.append(f"operation {i}: unsupported type {op_type!r}")
+        elif op_type == "set_timer":
+            if not isinstance(op.get("seconds", 15), int) or op.get("seconds", 15) <= 0:
+                errors.append(f"operation {i}: seconds must be a positive integer")
+        elif op.get("player_id") not in room.players or op.get("player_id") in kicked:
+            errors.append(f"operation {i}: unknown player {op.get('player_id')!r}")
+        elif op_type == "kick_player":
+            kicked.add(op["player_id"])
+        elif not isinstance(op.get("points" if op_type == "award_points" else "score", 0), (int, float)):
+            errors.append(f"operation {i}: score change must be a number")
+    return errors
+
+
+async def handle_host_batch(room: GameRoom, operations):
+    """Apply many score changes, kicks and timer changes with one leaderboard broadcast"""
+    errors = validate_batch(room, operations)
+    if errors:
+        await room.send_to_host({
+            "type": "batch_rejected",
+            "errors": errors
+        })
+        return
+
+    awarded: dict[str, float] = {}
+    kicked_sockets = []
+    timer_changed = False
+    for op in operations:
+        op_type = op["type"]
+        if op_type == "award_points":
+            room.players[op["player_id"]]["score"] += op.get("points", 0)
+            history.sink.record(room.room_id, "score_changed", player_id=op["player_id"],
+                                points=op.get("points", 0), source="batch")
+            awarded[op["player_id"]] = awarded.get(op["player_id"], 0) + op.get("points", 0)
+        elif op_type == "adjust_score":
+            room.players[op["player_id"]]["score"] = op.get("score", 0)
+            history.sink.record(room.room_id, "score_changed", player_id=op["player_id"],
+                                score=op.get("score", 0), source="batch")
+        elif op_type == "kick_player":
+            player = room.players.pop(op["player_id"])
+            awarded.pop(op["player_id"], None)
+            if player["ws"]:
+                kicked_sockets.append(player["ws"])
+        elif op_type == "set_timer":
+            room.timer_seconds = op.get("seconds", 15)
+            timer_changed = True
+    if timer_changed:
+        room.reencode_queue()
+
+    # Kicked players hear about it directly; everyone else gets one coalesced update
+    for ws in kicked_sockets:
+        await room._send(ws, "player", {"type": "kicked"})
+        await close_quietly(ws)
+    if timer_changed:
+        await room.send_to_host({
+            "type": "timer_updated",
+            "seconds": room.timer_seconds
+        })
+    await room.broadcast_to_all({
+        "type": "leaderboard_update",
+        "leaderboard": room.get_leaderboard(),
+        "awarded": awarded,
+        "kicked": [op["player_id"] for op in operations if op["type"] == "kick_player"]
+    })
+
+
+async def begin_question(room: GameRoom, question_data: dict, prepared: Optional[dict] = None):
+    """Start a question, reusing its pre-encoded frames if it was queued"""
+    room.cancel_auto_advance()
+    # Stop mini-game when first question starts
+    if room.mini_game_active:
+        room.stop_mini_game()
+        await room.broadcast_to_all({
+            "type": "mini_game_ended",
+            "winners": room.mini_game_finished[:2]
+        })
+
+    room.current_question = question_data
+    room.question_active = True
+    room.question_started_at = time.perf_counter()
+    room.reset_answers()
+    history.sink.record(
+        room.room_id, "question_started",
+        question_id=question_data.get("id"),
+        category=room.current_category,
+        question_type=question_data.get("type", "text"),
+        points=question_data.get("points", 100)
+    )
+
+    if prepared and prepared["timer"] == room.timer_seconds:
+        # Host gets the full question; players look at the host screen for it
+        await room.send_encoded(prepared["host_frame"], prepared["player_frame"])
+    else:
+        # Notify host with full question
+        await room.send_to_host({
+            "type": "question_started",
+            "question": question_data,
+            "timer": room.timer_seconds
+        })
+
+        # Notify players that question started (they look at host screen for question)
+        await room.broadcast_to_players({
+            "type": "question_started",
+            "timer": room.timer_seconds
+        })
+
+    # Start timer (skip for music questions - host controls playback)
+    is_music_question = question_data.get("type") == "music"
+    if not is_music_question:
+        if room.timer_task:
+            room.timer_task.cancel()
+        room.timer_task = asyncio.create_task(run_timer(room))
+
+
+async def handle_queue_questions(room: GameRoom, data: dict):
+    """Queue upcoming questions (ids or full questions), encoding their frames now"""
+    items = data.get("questions")
+    if not isinstance(items, list):
+        items = []
+    if data.get("replace"):
+        room.question_queue.clear()
+    missing = []
+    for item in items:
+        if len(room.question_queue) >= MAX_QUEUED_QUESTIONS:
+            break
+        question = room.question_store.get(item) if isinstance(item, str) else item
+        if not isinstance(question, dict):
+            missing.append(item)
+            continue
+        room.question_queue.append(room.prepare_question(question))
+    await room.send_to_host({
+        "type": "question_queue_updated",
+        **room.get_queue_state(),
+        "missing": missing
+    })
+
+
+def schedule_auto_advance(room: GameRoom):
+    room.cancel_auto_advance()
+    room.advance_task = asyncio.create_task(_auto_advance(room))
+
+
+async def _auto_advance(room: GameRoom):
+    # The next question is not caused by the reveal that scheduled it
+    tracing.current_cause.set(None)
+    await asyncio.sleep(room.auto_advance_pause)
+    room.advance_task = None
+    prepared = room.take_queued() if room.auto_advance else None
+    if prepared:
+        await begin_question(room, prepared["question"], prepared)
+        await room.send_to_host({
+            "type": "question_queue_updated",
+            **room.get_queue_state()
+        })
+
 
 async def run_timer(room: GameRoom):
     """Run the question timer"""
+    # Ticks are not caused by the start_question frame that spawned this task
+    tracing.current_cause.set(None)
     for remaining in range(room.timer_seconds, -1, -1):
         if not room.question_active:
             break
@@ -490,7 +1443,9 @@ async def run_timer(room: GameRoom):
             "remaining": remaining
         })
         if remaining > 0:
+            tick_started = time.perf_counter()
             await asyncio.sleep(1)
+            metrics.observe_tick("timer", 1, tick_started)
 
     if room.question_active:
         room.question_active = False
@@ -503,12 +1458,14 @@ async def run_timer(room: GameRoom):
 @app.websocket("/ws/player/{room_id}/{player_name}")
 async def player_websocket(websocket: WebSocket, room_id: str, player_name: str):
     """WebSocket connection for players"""
-    if room_id not in rooms:
+    room = resolve_room(room_id)
+    if room is None:
         await websocket.close(code=4004, reason="Room not found")
         return
 
     await websocket.accept()
-    room = rooms[room_id]
+    cancel_room_expiry(room)
+    room.start_heartbeat()
 
     # Check if player is reconnecting
     player_id = None
@@ -517,6 +1474,7 @@ async def player_websocket(websocket: WebSocket, room_id: str, player_name: str)
             player_id = pid
             room.players[pid]["ws"] = websocket
             room.players[pid]["connected"] = True
+            room.players[pid]["last_seen"] = time.monotonic()
             break
 
     # New player
@@ -526,7 +1484,9 @@ async def player_websocket(websocket: WebSocket, room_id: str, player_name: str)
             "name": player_name,
             "score": 0,
             "ws": websocket,
-            "connected": True
+            "connected": True,
+            "last_seen": time.monotonic(),
+            "rtt_ms": None
         }
 
     leaderboard = room.get_leaderboard()
@@ -566,9 +1526,10 @@ async def player_websocket(websocket: WebSocket, room_id: str, player_name: str)
     try:
         while True:
             data = await websocket.receive_json()
-            await handle_player_message(room, player_id, data)
+            await dispatch_message(room, "player", data, lambda: handle_player_message(room, player_id, data), player_id)
     except WebSocketDisconnect:
-        if player_id in room.players:
+        # Skip if the heartbeat already reaped this socket or the player reconnected
+        if player_id in room.players and room.players[player_id]["ws"] is websocket:
             room.players[player_id]["connected"] = False
             room.players[player_id]["ws"] = None
             await room.send_to_host({
@@ -579,9 +1540,10 @@ async def player_websocket(websocket: WebSocket, room_id: str, player_name: str)
             })
     except Exception as e:
         print(f"Player WebSocket error: {e}")
-        if player_id in room.players:
+        if player_id in room.players and room.players[player_id]["ws"] is websocket:
             room.players[player_id]["connected"] = False
             room.players[player_id]["ws"] = None
+    schedule_room_expiry(room)
 
 
 async def handle_player_message(room: GameRoom, player_id: str, data: dict):
@@ -601,15 +1563,21 @@ async def handle_player_message(room: GameRoom, player_id: str, data: dict):
             # Check if player already submitted
             if player_id in room.answer_submissions:
                 return  # Already answered, ignore
-
-            # Record submission with position
-            position = len(room.submission_order) + 1
-            room.answer_submissions[player_id] = {
-                "answer": answer,
-                "timestamp": datetime.now().isoformat(),
-                "position": position
-            }
-            room.submission_order.append(player_id)
+            if not room.is_valid_answer(answer):
+                return  # Not an option letter; nothing is recorded
+
+            # Positions follow the order answers are handled in
+            position = room.record_submission(player_id, answer)
+            started_at = room.question_started_at
+            history.sink.record(
+                room.room_id, "answer_submitted",
+                question_id=room.current_question.get("id") if room.current_question else None,
+                player_id=player_id,
+                answer=answer,
+                is_correct=room.answer_submissions[player_id]["is_correct"],
+                position=position,
+                latency_ms=round((time.perf_counter() - started_at) * 1000, 1) if started_at else None
+            )
 
             # Confirm to player
             await room.send_to_player(player_id, {
@@ -626,6 +1594,11 @@ async def handle_player_message(room: GameRoom, player_id: str, data: dict):
                 "total_players": connected_count
             })
 
+            room.schedule_answer_distribution()
+
+
+startup.mark("app and routes")
+
 
 if __name__ == "__main__":
     import uvicorn
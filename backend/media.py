@@ -0,0 +1,194 @@
+"""
+Question media (music rounds) served straight from a local directory.
+
+Files live under MEDIA_DIR (default backend/media), with music question audio
+in MEDIA_DIR/music/<audio_file>. Responses support single byte-range requests,
+carry a strong content-hash ETag and are cacheable for a long time; URLs from
+the prefetch manifest are versioned with that hash so browsers may keep them
+forever. When the server offers the ASGI zero-copy extension the body is sent
+with sendfile, otherwise it is streamed in chunks from a worker thread.
+"""
+
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+
+MEDIA_DIR = Path(os.getenv("MEDIA_DIR") or Path(__file__).parent / "media")
+
+# Plain URLs are revalidated hourly; hash-versioned URLs never change
+MEDIA_MAX_AGE = 3600
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+CHUNK_SIZE = 256 * 1024
+
+_etags: dict[Path, tuple[int, int, str]] = {}  # path -> (size, mtime_ns, etag)
+
+
+def resolve_media_path(relative: str) -> Optional[Path]:
+    """Map a request path to a file inside MEDIA_DIR, refusing anything outside it"""
+    root = MEDIA_DIR.resolve()
+    try:
+        path = (root / relative).resolve()
+    except (OSError, ValueError):
+        return None
+    if root not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def _hash_file(path: Path) -> str:
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=12)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def file_etag(path: Path, stat: os.stat_result) -> str:
+    """Strong ETag from the file contents, hashed once per size/mtime"""
+    cached = _etags.get(path)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    etag = f'"{await anyio.to_thread.run_sync(_hash_file, path)}"'
+    _etags[path] = (stat.st_size, stat.st_mtime_ns, etag)
+    return etag
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into (start, end) inclusive.
+    Returns None when the header should be ignored (multiple or malformed ranges)
+    and raises ValueError when the range can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if first:
+        start = int(first)
+        if start >= size:
+            raise ValueError("range not satisfiable")
+        end = int(last) if last else size - 1
+        if end < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        if int(last) == 0:
+            raise ValueError("empty suffix range")
+        if size == 0:
+            raise ValueError("range not satisfiable")
+        start, end = max(0, size - int(last)), size - 1
+    return start, min(end, size - 1)
+
+
+class MediaFileResponse(Response):
+    """Sends a byte range of a file, with sendfile when the server supports it"""
+
+    def __init__(self, path: Path, status_code: int, headers: dict, offset: int = 0,
+                 length: int = 0, send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # File shrank underneath us; end the response rather than hang
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def media_response(relative: str, request_headers, version: Optional[str], send_body: bool = True) -> Response:
+    path = resolve_media_path(relative)
+    if path is None:
+        return Response(status_code=404)
+    stat = path.stat()
+    size = stat.st_size
+    etag = await file_etag(path, stat)
+
+    immutable = version is not None and f'"{version}"' == etag
+    headers = {
+        "accept-ranges": "bytes",
+        "etag": etag,
+        "cache-control": (
+            f"public, max-age={IMMUTABLE_MAX_AGE}, immutable" if immutable else f"public, max-age={MEDIA_MAX_AGE}"
+        ),
+    }
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    headers["content-type"] = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(length)
+            return MediaFileResponse(path, 206, headers, start, length, send_body)
+
+    headers["content-length"] = str(size)
+    return MediaFileResponse(path, 200, headers, 0, size, send_body)
+
+
+async def prefetch_manifest(questions: list[dict]) -> list[dict]:
+    """Versioned URLs, sizes and ETags for the audio of the given questions"""
+    manifest = []
+    for question in questions:
+        audio_file = question.get("audio_file")
+        if question.get("type") != "music" or not audio_file:
+            continue
+        entry = {"question_id": question.get("id"), "audio_file": audio_file, "available": False}
+        path = resolve_media_path(f"music/{audio_file}")
+        if path is not None:
+            stat = path.stat()
+            etag = await file_etag(path, stat)
+            entry.update({
+                "available": True,
+                "url": f"/media/music/{quote(audio_file)}?v={etag.strip(chr(34))}",
+                "size": stat.st_size,
+                "etag": etag,
+                "content_type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            })
+        manifest.append(entry)
+    return manifest
@@ -0,0 +1,195 @@
+"""
+Lightweight Prometheus-style metrics for the Quiz Night backend.
+
+Everything here is plain dict/list arithmetic so it is cheap enough to leave
+on in production. Values are rendered in the Prometheus text exposition
+format by `render()`, which is served at /metrics.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Optional
+
+# Label values we will track per metric before folding new ones into "other".
+# Protects against unbounded cardinality from client-supplied message types.
+MAX_SERIES = 64
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+
+    def _key(self, values: tuple, series: dict) -> tuple:
+        """
+        Return the series key. Label values that aren't strings (client input such
+        as a list sent as a message type) become "other", as do new series once
+        MAX_SERIES is reached.
+        """
+        try:
+            if values in series:
+                return values
+        except TypeError:
+            pass  # Unhashable
+        values = tuple(value if isinstance(value, str) else "other" for value in values)
+        if values in series or len(series) < MAX_SERIES:
+            return values
+        return tuple("other" for _ in values)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        super().__init__(name, help_text, labels)
+        self.series: dict[tuple, float] = {}
+
+    def inc(self, *values, amount: float = 1):
+        key = self._key(values, self.series)
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def value(self, *values) -> float:
+        return self.series.get(values, 0)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for values, count in self.series.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge that is either set directly or computed at scrape time via a callback"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), callback: Optional[Callable] = None):
+        super().__init__(name, help_text, labels)
+        self.series: dict[tuple, float] = {}
+        self.callback = callback
+
+    def set(self, *values, value: float):
+        key = self._key(values, self.series)
+        self.series[key] = value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        if self.callback:
+            result = self.callback()
+            series = result if isinstance(result, dict) else {(): result}
+        else:
+            series = self.series
+        for values, value in series.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # values -> [per-bucket counts (+Inf last), sum, count]
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, *values, value: float):
+        key = self._key(values, self.series)
+        state = self.series.get(key)
+        if state is None:
+            state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self.series[key] = state
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def count(self, *values) -> int:
+        state = self.series.get(values)
+        return state[2] if state else 0
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for values, (bucket_counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labels + ("le",), values + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+registry: list[_Metric] = []
+
+
+def _register(metric):
+    registry.append(metric)
+    return metric
+
+
+def render() -> str:
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Socket traffic
+messages_in = _register(Counter(
+    "quiznight_messages_in_total", "WebSocket messages received", ("role", "type")))
+messages_out = _register(Counter(
+    "quiznight_messages_out_total", "WebSocket messages sent", ("role", "type")))
+send_failures = _register(Counter(
+    "quiznight_send_failures_total", "WebSocket sends that raised", ("role", "type")))
+dropped_connections = _register(Counter(
+    "quiznight_dropped_connections_total", "Sockets reaped after a failed send or missed heartbeats", ("role",)))
+heartbeat_rtt_seconds = _register(Histogram(
+    "quiznight_heartbeat_rtt_seconds", "Ping/pong round-trip time", ("role",)))
+broadcast_seconds = _register(Histogram(
+    "quiznight_broadcast_seconds", "Time to fan a message out to a room", ("target", "type")))
+
+# Event loop and game-loop health
+loop_lag_seconds = _register(Histogram(
+    "quiznight_event_loop_lag_seconds", "Delay between scheduled and actual wakeup of the lag probe"))
+tick_jitter_seconds = _register(Histogram(
+    "quiznight_tick_jitter_seconds", "Absolute drift of periodic game ticks from their schedule", ("loop",)))
+
+# Game history recorder
+history_events = _register(Counter(
+    "quiznight_history_events_total", "Game history events buffered for writing", ("event",)))
+history_dropped = _register(Counter(
+    "quiznight_history_events_dropped_total", "Game history events lost to a full buffer or write error"))
+
+
+def observe_tick(loop_name: str, expected: float, started: float):
+    """Record how far a periodic tick woke up from its intended interval"""
+    tick_jitter_seconds.observe(loop_name, value=abs((time.perf_counter() - started) - expected))
+
+
+async def monitor_event_loop(interval: float = 0.5):
+    """Background probe measuring how late the event loop wakes us up"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        loop_lag_seconds.observe(value=max(0.0, time.perf_counter() - started - interval))
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Opt-in profiling for the Quiz Night backend.
+
+When enabled (PROFILING=1 or via the admin endpoint) it logs any message
+handler or broadcast that takes longer than the slow threshold, together with
+the room id and message type, and logs event-loop lag spikes. A sampling
+profiler can also be run over a time window to produce folded stacks of
+handle_host_message/handle_player_message, which flamegraph.pl and speedscope
+read directly.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger("quiznight.profiler")
+
+# Functions whose stacks are kept by the sampling profiler
+PROFILED_FUNCTIONS = {"handle_host_message", "handle_player_message"}
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = os.getenv("PROFILING", "").lower() in ("1", "true", "yes")
+        self.slow_threshold = float(os.getenv("PROFILING_SLOW_MS", "50")) / 1000
+        self.lag_interval = 0.05
+        self.lag_task: Optional[asyncio.Task] = None
+        self.sampling = False
+
+    def configure(self, enabled: bool, slow_ms: Optional[float] = None):
+        """Toggle profiling at runtime"""
+        self.enabled = enabled
+        if slow_ms is not None:
+            self.slow_threshold = slow_ms / 1000
+        if enabled:
+            self.start_lag_sampler()
+        elif self.lag_task:
+            self.lag_task.cancel()
+            self.lag_task = None
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "slow_ms": self.slow_threshold * 1000,
+            "sampling": self.sampling,
+        }
+
+    def report(self, kind: str, room_id: str, msg_type, elapsed: float):
+        """Log a handler or broadcast if it exceeded the slow threshold"""
+        if self.enabled and elapsed >= self.slow_threshold:
+            logger.warning(
+                "slow %s room=%s type=%s took %.1fms", kind, room_id, msg_type, elapsed * 1000
+            )
+
+    @contextmanager
+    def track(self, kind: str, room_id: str, msg_type):
+        """Time the enclosed block and report it if slow"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.report(kind, room_id, msg_type, time.perf_counter() - started)
+
+    def start_lag_sampler(self):
+        if self.lag_task is None or self.lag_task.done():
+            self.lag_task = asyncio.create_task(self._sample_lag())
+
+    async def _sample_lag(self):
+        while self.enabled:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            lag = time.perf_counter() - started - self.lag_interval
+            if lag >= self.slow_threshold:
+                logger.warning("event loop lag %.1fms", lag * 1000)
+
+    async def sample_stacks(self, seconds: float, interval: float = 0.005) -> str:
+        """
+        Sample the event-loop thread for `seconds` and return folded stacks
+        ("frame;frame;frame count" per line) for the profiled handlers.
+        """
+        if self.sampling:
+            raise RuntimeError("A profile is already being captured")
+        loop_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        stop = threading.Event()
+
+        def sampler():
+            while not stop.wait(interval):
+                frame = sys._current_frames().get(loop_thread)
+                names = []
+                keep = False
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    keep = keep or code.co_name in PROFILED_FUNCTIONS
+                    frame = frame.f_back
+                if keep:
+                    stacks[";".join(reversed(names))] += 1
+
+        self.sampling = True
+        thread = threading.Thread(target=sampler, name="quiznight-profiler", daemon=True)
+        thread.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(thread.join)
+            self.sampling = False
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+profiler = Profiler()
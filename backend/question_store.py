@@ -0,0 +1,427 @@
+"""
+Question bank storage.
+
+By default questions come from questions.json, as before. For large banks set
+QUESTIONS_DB to a SQLite file built with the importer below; questions are then
+fetched on demand through indexes on category, points and id, with FTS5
+full-text search for the host.
+
+Import a JSON bank (streamed, so the file is never parsed in one piece):
+
+    python question_store.py import questions.json questions.db
+
+Compile questions.json into a marshal snapshot that loads without JSON parsing
+and carries the pre-encoded /api/questions body (done in the Docker build):
+
+    python question_store.py compile questions.json questions.bin
+"""
+
+import json
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+QUESTIONS_FILE = Path(__file__).parent / "questions.json"
+COMPILED_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_category ON questions (category, position);
+CREATE INDEX IF NOT EXISTS questions_category_points ON questions (category, points);
+CREATE INDEX IF NOT EXISTS questions_points ON questions (points);
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5 (
+    question, options, category UNINDEXED, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def compile_catalog(json_path: Path, out_path: Path) -> int:
+    """Snapshot a JSON bank with its id index and encoded form for fast loading"""
+    stat = json_path.stat()
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    snapshot = {
+        "format": COMPILED_FORMAT,
+        "python": list(sys.version_info[:2]),
+        "source": [stat.st_size, stat.st_mtime_ns],
+        "data": data,
+        "index": _build_index(data),
+        "encoded": json.dumps(data).encode(),
+    }
+    with open(out_path, "wb") as f:
+        marshal.dump(snapshot, f)
+    return sum(len(questions) for questions in data.get("categories", {}).values())
+
+
+def load_compiled(path: Path, source: os.stat_result) -> Optional[dict]:
+    """Read a compiled snapshot, or None if it is missing or out of date"""
+    try:
+        with open(path, "rb") as f:
+            snapshot = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("format") != COMPILED_FORMAT
+        or snapshot.get("python") != list(sys.version_info[:2])
+        or snapshot.get("source") != [source.st_size, source.st_mtime_ns]
+    ):
+        return None
+    return snapshot
+
+
+def _build_index(data: dict) -> dict:
+    """question id -> (category, position), first occurrence wins"""
+    index = {}
+    for category, questions in data.get("categories", {}).items():
+        for position, question in enumerate(questions):
+            if "id" in question:
+                index.setdefault(question["id"], (category, position))
+    return index
+
+
+class _Catalog(NamedTuple):
+    """One loaded version of a JSON bank"""
+    mtime_ns: Optional[int]
+    data: dict
+    index: dict  # question id -> (category, position)
+    encoded: Optional[bytes]  # /api/questions body, filled in on first use
+    compiled: bool  # loaded from the snapshot rather than the JSON
+
+
+_EMPTY_CATALOG = _Catalog(None, {"categories": {}}, {}, None, False)
+
+
+class JsonQuestionStore:
+    """The bundled questions.json, re-read only when the file changes"""
+
+    def __init__(self, path: Path = QUESTIONS_FILE, compiled_path: Optional[Path] = None):
+        self.path = path
+        # questions.bin next to questions.json, written by compile_catalog
+        self.compiled_path = compiled_path or path.with_suffix(".bin")
+        # Replaced as a whole so the preload thread and the event loop never see half of a reload
+        self._catalog = _EMPTY_CATALOG
+        self._lock = threading.Lock()
+
+    @property
+    def compiled(self) -> bool:
+        """Whether the loaded catalog came from the snapshot"""
+        return self._catalog.compiled
+
+    def _current(self) -> _Catalog:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return _EMPTY_CATALOG
+        catalog = self._catalog
+        if catalog.mtime_ns == stat.st_mtime_ns:
+            return catalog
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            if self._catalog.mtime_ns != stat.st_mtime_ns:
+                snapshot = load_compiled(self.compiled_path, stat)
+                if snapshot:
+                    data, index, encoded = snapshot["data"], snapshot["index"], snapshot["encoded"]
+                else:
+                    with open(self.path, "r") as f:
+                        data = json.load(f)
+                    index, encoded = _build_index(data), None
+                self._catalog = _Catalog(stat.st_mtime_ns, data, index, encoded, snapshot is not None)
+            return self._catalog
+
+    def _load(self) -> dict:
+        return self._current().data
+
+    def preload(self):
+        self._current()
+
+    def all(self) -> dict:
+        return self._load()
+
+    def encoded(self) -> bytes:
+        """The whole bank as JSON bytes, encoded once per file version"""
+        catalog = self._current()
+        if catalog.encoded is None:
+            encoded = json.dumps(catalog.data).encode()
+            with self._lock:
+                if self._catalog is catalog:
+                    self._catalog = catalog._replace(encoded=encoded)
+            return encoded
+        return catalog.encoded
+
+    def categories(self) -> list[dict]:
+        return [{"name": name, "count": len(qs)} for name, qs in self._load().get("categories", {}).items()]
+
+    def questions(self, category: str, offset: int = 0, limit: int = 100) -> list[dict]:
+        return self._load().get("categories", {}).get(category, [])[offset:offset + limit]
+
+    def get(self, question_id: str) -> Optional[dict]:
+        catalog = self._current()
+        location = catalog.index.get(question_id)
+        if location is None:
+            return None
+        category, position = location
+        return catalog.data["categories"][category][position]
+
+    def search(self, text: str, category: Optional[str] = None, limit: int = 20) -> list[dict]:
+        needle = text.casefold()
+        results = []
+        for name, questions in self._load().get("categories", {}).items():
+            if category and name != category:
+                continue
+            for question in questions:
+                haystack = " ".join([question.get("question", "")] + question.get("options", []))
+                if needle in haystack.casefold():
+                    results.append(question)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+
+class SqliteQuestionStore:
+    """Indexed, lazily queried question bank in a local SQLite file"""
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.path = path
+        # Queries are short indexed lookups, so they run inline on the event loop
+        self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._encoded: Optional[tuple] = None  # (file version, JSON bytes)
+        self._encode_lock = threading.Lock()
+
+    def all(self) -> dict:
+        return self._dump(self.db)
+
+    def _dump(self, db) -> dict:
+        categories: dict[str, list] = {}
+        for category, data in db.execute("SELECT category, data FROM questions ORDER BY category, position"):
+            categories.setdefault(category, []).append(json.loads(data))
+        return {"categories": categories}
+
+    def _version(self) -> tuple:
+        # Writes in WAL mode land in the -wal file before the main file changes
+        version = []
+        for path in (self.path, f"{self.path}-wal"):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def preload(self):
+        # Questions are fetched per query; only the full-bank body is worth warming
+        self.encoded()
+
+    def encoded(self) -> bytes:
+        """
+        The whole bank as JSON bytes, rebuilt only when the database file changes.
+        Scans every row when it does, so call it from a worker thread.
+        """
+        import sqlite3
+
+        with self._encode_lock:
+            version = self._version()
+            if self._encoded is None or self._encoded[0] != version:
+                # A connection of our own: the shared one belongs to the event loop thread
+                db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+                try:
+                    self._encoded = (version, json.dumps(self._dump(db)).encode())
+                finally:
+                    db.close()
+            return self._encoded[1]
+
+    def categories(self) -> list[dict]:
+        rows = self.db.execute(
+            "SELECT category, COUNT(*) FROM questions GROUP BY category ORDER BY MIN(rowid)"
+        )
+        return [{"name": name, "count": count} for name, count in rows]
+
+    def questions(self, category: str, offset: int = 0, limit: int = 100) -> list[dict]:
+        rows = self.db.execute(
+            "SELECT data FROM questions WHERE category = ? ORDER BY position LIMIT ? OFFSET ?",
+            (category, limit, offset),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def get(self, question_id: str) -> Optional[dict]:
+        row = self.db.execute("SELECT data FROM questions WHERE id = ?", (question_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search(self, text: str, category: Optional[str] = None, limit: int = 20) -> list[dict]:
+        # Quote each term so user input can't inject FTS query syntax
+        terms = " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+        if not terms:
+            return []
+        sql = (
+            "SELECT q.data FROM questions_fts f JOIN questions q ON q.rowid = f.rowid "
+            "WHERE questions_fts MATCH ?"
+        )
+        params: list = [terms]
+        if category:
+            sql += " AND q.category = ?"
+            params.append(category)
+        sql += " ORDER BY f.rank LIMIT ?"
+        params.append(limit)
+        return [json.loads(data) for (data,) in self.db.execute(sql, params)]
+
+
+_store = None
+
+
+def get_question_store():
+    """The configured store: SQLite when QUESTIONS_DB is set, else questions.json"""
+    global _store
+    if _store is None:
+        db_path = os.getenv("QUESTIONS_DB")
+        _store = SqliteQuestionStore(db_path) if db_path else JsonQuestionStore()
+    return _store
+
+
+class _JsonStream:
+    """Minimal pull parser over a file, decoding one JSON value at a time"""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in question bank at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may be cut short; make sure it is complete
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[tuple[str, "_JsonStream"]]:
+        """Iterate over an object's keys, leaving the stream at each value"""
+        self.expect("{")
+        while self.peek() != "}":
+            key = self.value()
+            self.expect(":")
+            yield key, self
+            if self.peek() == ",":
+                self.pos += 1
+        self.pos += 1
+
+    def array(self) -> Iterator:
+        self.expect("[")
+        while self.peek() != "]":
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+        self.pos += 1
+
+
+def iter_json_questions(path: Path, chunk_size: int = 1 << 16) -> Iterator[tuple[str, int, dict]]:
+    """Stream (category, position, question) out of a questions.json-format file"""
+    with open(path, "r") as f:
+        stream = _JsonStream(f, chunk_size)
+        for key, _ in stream.items():
+            if key != "categories":
+                stream.value()
+                continue
+            for category, _ in stream.items():
+                for position, question in enumerate(stream.array()):
+                    yield category, position, question
+
+
+def import_json(json_path: Path, db_path: Path, batch_size: int = 1000) -> int:
+    """Build (or extend) a SQLite question store from a JSON bank"""
+    import sqlite3
+
+    db = sqlite3.connect(db_path)
+    db.executescript(SCHEMA)
+    count = 0
+    batch = []
+
+    def flush():
+        for category, position, question in batch:
+            question_id = str(question.get("id") or f"{category}:{position}")
+            question = {**question, "id": question_id}
+            existing = db.execute("SELECT rowid FROM questions WHERE id = ?", (question_id,)).fetchone()
+            if existing:
+                # FTS content is external, so the old terms have to be removed explicitly
+                old = db.execute("SELECT data FROM questions WHERE rowid = ?", existing).fetchone()
+                old_question = json.loads(old[0])
+                db.execute(
+                    "INSERT INTO questions_fts (questions_fts, rowid, question, options, category) "
+                    "VALUES ('delete', ?, ?, ?, ?)",
+                    (existing[0], old_question.get("question", ""), " ".join(old_question.get("options", [])), None),
+                )
+                db.execute("DELETE FROM questions WHERE rowid = ?", existing)
+            cursor = db.execute(
+                "INSERT INTO questions (id, category, position, points, data) VALUES (?, ?, ?, ?, ?)",
+                (question_id, category, position, int(question.get("points", 100)),
+                 json.dumps(question, ensure_ascii=False)),
+            )
+            db.execute(
+                "INSERT INTO questions_fts (rowid, question, options, category) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, question.get("question", ""), " ".join(question.get("options", [])), category),
+            )
+        batch.clear()
+
+    with db:
+        for entry in iter_json_questions(json_path):
+            batch.append(entry)
+            count += 1
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    db.close()
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("import", "compile"):
+        print("Usage: python question_store.py import <questions.json> <questions.db>")
+        print("       python question_store.py compile <questions.json> <questions.bin>")
+        sys.exit(1)
+    if sys.argv[1] == "compile":
+        compiled = compile_catalog(Path(sys.argv[2]), Path(sys.argv[3]))
+        print(f"Compiled {compiled} questions into {sys.argv[3]}")
+    else:
+        imported = import_json(Path(sys.argv[2]), Path(sys.argv[3]))
+        print(f"Imported {imported} questions into {sys.argv[3]}")
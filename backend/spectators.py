@@ -0,0 +1,122 @@
+"""
+Read-only spectator feed for big-screen displays and remote viewers.
+
+Spectators never sit on the player broadcast path. Rooms hand frames to a
+SpectatorHub with `publish()`, which only records the latest frame per
+channel (leaderboard, timer, mini_game, tournament). A per-room flusher wakes
+at most once per throttle interval, JSON-encodes each changed frame once and
+drops it into every spectator's feed. Each spectator connection drains its
+own feed, so a slow viewer only misses intermediate frames and never delays
+players.
+"""
+
+import asyncio
+import json
+import os
+from typing import Optional
+
+SPECTATOR_THROTTLE = float(os.getenv("SPECTATOR_THROTTLE_MS", "250")) / 1000
+
+# Frame types forwarded to spectators, by the channel they conflate on
+CHANNELS = {
+    "leaderboard_update": "leaderboard",
+    "timer_tick": "timer",
+    "timer_expired": "timer",
+    "mini_game_update": "mini_game",
+    "mini_game_ended": "mini_game",
+    "global_standings": "tournament",
+}
+
+
+def spectator_frame(message: dict) -> Optional[tuple[str, dict]]:
+    """Map a room message to (channel, frame), or None if spectators don't see it"""
+    channel = CHANNELS.get(message.get("type"))
+    if channel:
+        return channel, message
+    # Anything else carrying a fresh leaderboard (reveals, joins, kicks) updates the board
+    if "leaderboard" in message:
+        return "leaderboard", {"type": "leaderboard_update", "leaderboard": message["leaderboard"]}
+    return None
+
+
+class SpectatorFeed:
+    """Latest encoded frame per channel for one spectator connection"""
+
+    def __init__(self):
+        self.pending: dict[str, tuple[str, str]] = {}  # channel -> (event type, json)
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def push(self, channel: str, event: str, encoded: str):
+        self.pending[channel] = (event, encoded)
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> list[tuple[str, str]]:
+        """Wait for frames; returns [] on timeout or once the feed is closed"""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.ready.clear()
+        frames = list(self.pending.values())
+        self.pending.clear()
+        return frames
+
+
+class SpectatorHub:
+    """Throttled fan-out tier for one room's spectators"""
+
+    def __init__(self, throttle: float = SPECTATOR_THROTTLE):
+        self.throttle = throttle
+        self.feeds: set[SpectatorFeed] = set()
+        self.latest: dict[str, dict] = {}  # channel -> last frame, for new subscribers
+        self.dirty: dict[str, dict] = {}
+        self.wake = asyncio.Event()
+        self.flusher: Optional[asyncio.Task] = None
+
+    def publish(self, message: dict):
+        """Record a room message for spectators; O(1) and never awaits"""
+        mapped = spectator_frame(message)
+        if mapped is None:
+            return
+        channel, frame = mapped
+        self.latest[channel] = frame
+        if self.feeds:
+            self.dirty[channel] = frame
+            self.wake.set()
+
+    def subscribe(self, snapshot: dict[str, dict]) -> SpectatorFeed:
+        """Register a spectator, seeding its feed with the current state"""
+        feed = SpectatorFeed()
+        for channel, frame in {**snapshot, **self.latest}.items():
+            feed.push(channel, frame["type"], json.dumps(frame))
+        self.feeds.add(feed)
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self._flush())
+        return feed
+
+    def unsubscribe(self, feed: SpectatorFeed):
+        self.feeds.discard(feed)
+        self.wake.set()
+
+    def close(self):
+        for feed in self.feeds:
+            feed.close()
+        self.feeds.clear()
+        self.wake.set()
+
+    async def _flush(self):
+        while self.feeds:
+            await self.wake.wait()
+            self.wake.clear()
+            dirty, self.dirty = self.dirty, {}
+            encoded = {channel: (frame["type"], json.dumps(frame)) for channel, frame in dirty.items()}
+            for feed in list(self.feeds):
+                for channel, (event, data) in encoded.items():
+                    feed.push(channel, event, data)
+            await asyncio.sleep(self.throttle)
+        self.dirty = {}
@@ -0,0 +1,63 @@
+"""
+Cold-start timing.
+
+main.py marks each phase of its boot (imports, settings, app and routes,
+lifespan) plus milestones such as the catalog preload and the first room
+created. `report()` returns the breakdown, which is logged once the server is
+ready and served at /api/admin/startup. Time spent before main.py started
+importing (interpreter and site startup) is read from /proc where available.
+"""
+
+import os
+import time
+from typing import Optional
+
+_origin = time.perf_counter()
+_last = _origin
+phases: list[tuple[str, float]] = []  # (phase, seconds), in boot order
+milestones: dict[str, float] = {}  # name -> seconds since main.py started importing
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process was started, from /proc (Linux only)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; starttime is field 22 of the full line
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_before_main = process_age()
+
+
+def mark(phase: str):
+    """Close the current boot phase"""
+    global _last
+    now = time.perf_counter()
+    phases.append((phase, now - _last))
+    _last = now
+
+
+def milestone(name: str):
+    """Record the first time something happened (later calls are ignored)"""
+    if name not in milestones:
+        milestones[name] = time.perf_counter() - _origin
+
+
+def report() -> dict:
+    return {
+        "before_main_ms": round(_before_main * 1000, 1) if _before_main is not None else None,
+        "phases_ms": {phase: round(seconds * 1000, 1) for phase, seconds in phases},
+        "milestones_ms": {name: round(seconds * 1000, 1) for name, seconds in milestones.items()},
+    }
+
+
+def summary() -> str:
+    parts = [f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in phases]
+    if _before_main is not None:
+        parts.insert(0, f"before main {_before_main * 1000:.0f}ms")
+    return "Startup: " + ", ".join(parts)
@@ -6,26 +6,7 @@ Run with: pytest test_answer_selection.py -v
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock
-from main import GameRoom, handle_player_message, handle_host_message
-
-
-@pytest.fixture
-def room():
-    """Create a fresh game room for each test."""
-    room = GameRoom("test-room", "Test Host")
-    room.host_ws = AsyncMock()
-    return room
-
-
-@pytest.fixture
-def room_with_players(room):
-    """Create a room with 3 connected players."""
-    room.players = {
-        "player1": {"name": "Alice", "score": 0, "ws": AsyncMock(), "connected": True},
-        "player2": {"name": "Bob", "score": 0, "ws": AsyncMock(), "connected": True},
-        "player3": {"name": "Charlie", "score": 0, "ws": AsyncMock(), "connected": True},
-    }
-    return room
+from main import handle_player_message, handle_host_message
 
 
 @pytest.fixture
@@ -130,6 +111,37 @@ class TestAnswerSubmission:
         assert call_args["total_players"] == 3
 
 
+class TestAnswerOrder:
+    """Test that positions follow the order answers are handled in."""
+
+    @pytest.mark.asyncio
+    async def test_positions_follow_handling_order(self, room_with_players):
+        room = room_with_players
+        room.question_active = True
+        room.current_question = {"points": 100}
+
+        await handle_player_message(room, "player2", {"type": "submit_answer", "answer": "B"})
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "A"})
+
+        assert room.submission_order == ["player2", "player1"]
+        assert room.answer_submissions["player2"]["position"] == 1
+        assert room.answer_submissions["player1"]["position"] == 2
+
+    @pytest.mark.asyncio
+    async def test_scoring_uses_submission_order(self, room_with_players, question):
+        """Multipliers follow submission order at reveal."""
+        room = room_with_players
+        room.current_question = question
+        room.question_active = True
+
+        await handle_player_message(room, "player2", {"type": "submit_answer", "answer": "B"})
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "B"})
+        await handle_host_message(room, {"type": "reveal_answer"})
+
+        assert room.players["player2"]["score"] == 100
+        assert room.players["player1"]["score"] == 75
+
+
 class TestAutoScoring:
     """Test automatic scoring when answer is revealed."""
 
@@ -276,6 +288,76 @@ class TestAutoScoring:
         assert results_by_id["player3"]["points"] == -25
 
 
+class TestAnswerDistribution:
+    """Test the live per-option answer counts."""
+
+    @pytest.mark.asyncio
+    async def test_counts_updated_per_submission(self, room_with_players, question):
+        """Each submission bumps its option and the correct counter."""
+        room = room_with_players
+        room.current_question = question
+        room.question_active = True
+
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "B"})
+        await handle_player_message(room, "player2", {"type": "submit_answer", "answer": "A"})
+        await handle_player_message(room, "player3", {"type": "submit_answer", "answer": "B"})
+        room.distribution_task.cancel()
+
+        distribution = room.get_answer_distribution()
+        assert distribution["counts"] == {"A": 1, "B": 2, "C": 0, "D": 0}
+        assert distribution["correct_count"] == 2
+        assert distribution["first_correct"] == "player1"
+
+    @pytest.mark.asyncio
+    async def test_invalid_answer_ignored(self, room_with_players, question):
+        """Answers that aren't option letters are dropped before anything is recorded."""
+        room = room_with_players
+        room.current_question = question
+        room.question_active = True
+
+        for answer in (["A"], {"x": 1}, None, "E", "AB", "a"):
+            await handle_player_message(room, "player1", {"type": "submit_answer", "answer": answer})
+
+        assert room.answer_submissions == {}
+        assert room.answer_counts == {}
+        room.players["player1"]["ws"].send_json.assert_not_called()
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "D"})
+        assert room.answer_submissions["player1"]["position"] == 1
+        room.distribution_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_host_gets_one_throttled_frame(self, room_with_players, question, monkeypatch):
+        """A burst of answers produces a single answer_distribution frame."""
+        monkeypatch.setattr("main.ANSWER_DISTRIBUTION_INTERVAL", 0)
+        room = room_with_players
+        room.current_question = question
+        room.question_active = True
+
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "B"})
+        await handle_player_message(room, "player2", {"type": "submit_answer", "answer": "C"})
+        await room.distribution_task
+
+        frames = [c[0][0] for c in room.host_ws.send_json.call_args_list if c[0][0]["type"] == "answer_distribution"]
+        assert len(frames) == 1
+        assert frames[0]["counts"]["B"] == 1
+        assert frames[0]["counts"]["C"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reveal_includes_distribution(self, room_with_players, question):
+        """answer_revealed carries the aggregates instead of a rescan."""
+        room = room_with_players
+        room.current_question = question
+        room.question_active = True
+
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "B"})
+        await handle_host_message(room, {"type": "reveal_answer"})
+
+        reveal = room.host_ws.send_json.call_args[0][0]
+        assert reveal["type"] == "answer_revealed"
+        assert reveal["answer_distribution"]["correct_count"] == 1
+        assert room.distribution_task is None
+
+
 class TestQuestionLifecycle:
     """Test the full question lifecycle."""
 
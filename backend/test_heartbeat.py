@@ -0,0 +1,81 @@
+"""
+Tests for heartbeat-based dead-connection detection.
+Run with: pytest test_heartbeat.py -v
+"""
+
+import time
+import asyncio
+import pytest
+
+import main
+from main import dispatch_message
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room with every client seen just now."""
+    room_with_players.host_last_seen = time.monotonic()
+    for player in room_with_players.players.values():
+        player["last_seen"] = time.monotonic()
+    return room_with_players
+
+
+class TestFailedSends:
+    """Test that a failed send takes the socket out of fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_failed_send_marks_player_disconnected(self, room_with_players):
+        room = room_with_players
+        dead_ws = room.players["player2"]["ws"]
+        dead_ws.send_json.side_effect = RuntimeError("connection reset")
+
+        await room.broadcast_to_all({"type": "buzzer_locked"})
+        await room.broadcast_to_all({"type": "question_cleared"})
+
+        assert room.players["player2"]["connected"] == False
+        assert room.players["player2"]["ws"] is None
+        assert dead_ws.send_json.call_count == 1  # second broadcast skipped it
+
+    @pytest.mark.asyncio
+    async def test_host_told_about_dropped_player(self, room_with_players):
+        room = room_with_players
+        room.players["player2"]["ws"].send_json.side_effect = RuntimeError("connection reset")
+
+        await room.broadcast_to_all({"type": "buzzer_locked"})
+        await asyncio.sleep(0)
+
+        sent = [call[0][0]["type"] for call in room.host_ws.send_json.call_args_list]
+        assert "player_disconnected" in sent
+
+
+class TestHeartbeat:
+    """Test ping/pong and reaping of silent connections."""
+
+    @pytest.mark.asyncio
+    async def test_silent_player_reaped_and_live_player_pinged(self, room_with_players, monkeypatch):
+        room = room_with_players
+        monkeypatch.setattr(main, "HEARTBEAT_INTERVAL", 0.01)
+        monkeypatch.setattr(main, "HEARTBEAT_TIMEOUT", 5)
+        room.players["player2"]["last_seen"] = time.monotonic() - 10
+
+        room.start_heartbeat()
+        await asyncio.sleep(0.05)
+        room.heartbeat_task.cancel()
+
+        assert room.players["player2"]["connected"] == False
+        assert room.players["player1"]["connected"] == True
+        ping = room.players["player1"]["ws"].send_json.call_args[0][0]
+        assert ping["type"] == "ping"
+
+    @pytest.mark.asyncio
+    async def test_pong_records_rtt(self, room_with_players):
+        room = room_with_players
+        ping_sent = main.tracing.now_ms() - 40
+
+        await dispatch_message(room, "player", {"type": "pong", "t": ping_sent}, None, "player1")
+
+        assert room.players["player1"]["rtt_ms"] >= 40
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+"""
+Tests for game history recording, export and aggregation.
+Run with: pytest test_history.py -v
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import history
+import main
+from history import EventSink, aggregate, iter_events
+from main import app, handle_host_message, handle_player_message
+
+QUESTION = {
+    "id": "q1",
+    "question": "What is 2+2?",
+    "options": ["3", "4", "5", "6"],
+    "correct_answer": "4",
+    "points": 100
+}
+
+
+@pytest.fixture
+def sink(tmp_path, monkeypatch):
+    """Record into a temporary directory."""
+    sink = EventSink(str(tmp_path), flush_interval=60)
+    monkeypatch.setattr(history, "sink", sink)
+    return sink
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room, past the mini-game."""
+    room_with_players.mini_game_active = False
+    return room_with_players
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    """Configure an admin token and return the header that carries it."""
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "test-token")
+    return {"X-Admin-Token": "test-token"}
+
+
+def read_events(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestEventSink:
+    """Test buffering and writing events."""
+
+    @pytest.mark.asyncio
+    async def test_record_only_buffers(self, sink, tmp_path):
+        sink.record("room-1", "score_changed", player_id="p1", points=10)
+
+        assert sink.buffered == 1
+        assert not (tmp_path / "room-1.ndjson").exists()
+
+        await sink.close()
+        events = read_events(tmp_path / "room-1.ndjson")
+        assert events[0]["event"] == "score_changed"
+        assert events[0]["room_id"] == "room-1"
+        assert events[0]["points"] == 10
+
+    @pytest.mark.asyncio
+    async def test_flushes_append_in_order(self, sink, tmp_path):
+        sink.record("room-1", "a")
+        await sink.flush()
+        sink.record("room-1", "b")
+        await sink.close()
+
+        assert [e["event"] for e in read_events(tmp_path / "room-1.ndjson")] == ["a", "b"]
+
+    def test_disabled_and_unsafe_ids_ignored(self, tmp_path):
+        assert EventSink(None).path_for("room-1") is None
+        EventSink(None).record("room-1", "a")
+
+        sink = EventSink(str(tmp_path))
+        sink.record("../escape", "a")
+        assert sink.buffered == 0
+
+
+class TestGameRecording:
+    """Test that a played question ends up in the history."""
+
+    @pytest.mark.asyncio
+    async def test_question_submissions_and_reveal(self, sink, room_with_players, tmp_path):
+        room = room_with_players
+        await handle_host_message(room, {"type": "start_question", "question": QUESTION})
+        await handle_player_message(room, "player1", {"type": "submit_answer", "answer": "B"})
+        await handle_host_message(room, {"type": "reveal_answer"})
+        await handle_host_message(room, {"type": "award_points", "player_id": "player2", "points": 20})
+        await sink.close()
+
+        events = read_events(tmp_path / "test-room.ndjson")
+        assert [e["event"] for e in events] == [
+            "question_started", "answer_submitted", "answer_revealed", "score_changed"
+        ]
+        submitted = events[1]
+        assert submitted["question_id"] == "q1"
+        assert submitted["is_correct"] == True
+        assert submitted["latency_ms"] >= 0
+        assert {r["player_id"]: r["points"] for r in events[2]["results"]} == {"player1": 100, "player2": -25, "player3": -25}
+
+
+class TestExport:
+    """Test the streaming export endpoint."""
+
+    def test_export_room_history(self, sink, tmp_path, admin):
+        (tmp_path / "room-1.ndjson").write_text(json.dumps({"event": "question_started"}) + "\n")
+        client = TestClient(app)
+
+        response = client.get("/api/rooms/room-1/history", headers=admin)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["event"] for line in response.text.splitlines()] == ["question_started"]
+
+    def test_export_requires_admin(self, sink, tmp_path, admin):
+        """Answers and their correctness must not leak to players mid-question."""
+        (tmp_path / "room-1.ndjson").write_text(json.dumps({"event": "answer_submitted"}) + "\n")
+
+        assert TestClient(app).get("/api/rooms/room-1/history").status_code == 403
+
+    def test_unknown_room(self, sink, admin):
+        assert TestClient(app).get("/api/rooms/missing/history", headers=admin).status_code == 404
+
+
+class TestAggregate:
+    """Test per-question statistics across games."""
+
+    def test_accuracy_and_latency(self, tmp_path):
+        lines = []
+        for game in ("g1", "g2"):
+            lines.append({"event": "question_started", "room_id": game, "question_id": "q1", "category": "Maths"})
+            lines.append({"event": "answer_submitted", "room_id": game, "question_id": "q1",
+                          "answer": "B", "is_correct": True, "latency_ms": 1000 if game == "g1" else 3000})
+            lines.append({"event": "answer_revealed", "room_id": game, "question_id": "q1",
+                          "results": [{"answer": "B"}, {"answer": None}]})
+        lines.append({"event": "answer_submitted", "room_id": "g2", "question_id": "q1",
+                      "answer": "A", "is_correct": False, "latency_ms": 2000})
+        (tmp_path / "games.ndjson").write_text("\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+
+        [stats] = aggregate(iter_events([tmp_path]))
+
+        assert stats["question_id"] == "q1"
+        assert stats["category"] == "Maths"
+        assert stats["games"] == 2
+        assert stats["answers"] == 3
+        assert stats["accuracy"] == 0.667
+        assert stats["no_answer"] == 2
+        assert stats["answer_counts"] == {"B": 2, "A": 1}
+        assert stats["latency_ms"]["p50"] == 2000
+        assert stats["latency_ms"]["mean"] == 2000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
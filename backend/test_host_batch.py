@@ -0,0 +1,87 @@
+"""
+Tests for batched host operations.
+Run with: pytest test_host_batch.py -v
+"""
+
+import pytest
+
+from main import handle_host_message
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room with players on 100, 50 and 0 points."""
+    for player, score in zip(room_with_players.players.values(), (100, 50, 0)):
+        player["score"] = score
+    return room_with_players
+
+
+def host_frames(room, msg_type):
+    return [c[0][0] for c in room.host_ws.send_json.call_args_list if c[0][0]["type"] == msg_type]
+
+
+class TestBatch:
+    """Test applying many host operations at once."""
+
+    @pytest.mark.asyncio
+    async def test_batch_applies_all_with_one_broadcast(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "batch", "operations": [
+            {"type": "award_points", "player_id": "player1", "points": 25},
+            {"type": "award_points", "player_id": "player1", "points": -10},
+            {"type": "adjust_score", "player_id": "player2", "score": 500},
+            {"type": "kick_player", "player_id": "player3"},
+            {"type": "set_timer", "seconds": 30},
+        ]})
+
+        assert room.players["player1"]["score"] == 115
+        assert room.players["player2"]["score"] == 500
+        assert "player3" not in room.players
+        assert room.timer_seconds == 30
+
+        updates = host_frames(room, "leaderboard_update")
+        assert len(updates) == 1
+        assert [p["id"] for p in updates[0]["leaderboard"]] == ["player2", "player1"]
+        assert updates[0]["awarded"] == {"player1": 15}
+        assert updates[0]["kicked"] == ["player3"]
+        assert host_frames(room, "timer_updated") == [{"type": "timer_updated", "seconds": 30}]
+
+    @pytest.mark.asyncio
+    async def test_kicked_player_notified(self, room_with_players):
+        room = room_with_players
+        kicked_ws = room.players["player3"]["ws"]
+
+        await handle_host_message(room, {"type": "batch", "operations": [
+            {"type": "kick_player", "player_id": "player3"},
+        ]})
+
+        kicked_ws.send_json.assert_called_once_with({"type": "kicked"})
+        kicked_ws.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_changes_nothing(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "batch", "operations": [
+            {"type": "award_points", "player_id": "player1", "points": 25},
+            {"type": "award_points", "player_id": "ghost", "points": 25},
+        ]})
+
+        assert room.players["player1"]["score"] == 100
+        assert host_frames(room, "leaderboard_update") == []
+        rejected = host_frames(room, "batch_rejected")
+        assert rejected[0]["errors"] == ["operation 1: unknown player 'ghost'"]
+
+    @pytest.mark.asyncio
+    async def test_operation_on_player_kicked_earlier_in_batch_rejected(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "batch", "operations": [
+            {"type": "kick_player", "player_id": "player3"},
+            {"type": "award_points", "player_id": "player3", "points": 10},
+        ]})
+
+        assert "player3" in room.players
+        assert len(host_frames(room, "batch_rejected")) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Tests for question media serving.
+Run with: pytest test_media.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import media
+from main import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Serve a media directory with one 1000-byte track."""
+    (tmp_path / "music").mkdir()
+    (tmp_path / "music" / "track one.mp3").write_bytes(bytes(range(250)) * 4)
+    (tmp_path.parent / "secret.txt").write_text("nope")
+    monkeypatch.setattr(media, "MEDIA_DIR", tmp_path)
+    with TestClient(app) as client:
+        yield client
+
+
+class TestMediaServing:
+    """Test range requests and caching headers."""
+
+    def test_full_file(self, client):
+        response = client.get("/media/music/track one.mp3")
+
+        assert response.status_code == 200
+        assert len(response.content) == 1000
+        assert response.headers["content-type"] == "audio/mpeg"
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"].startswith('"')
+
+    def test_byte_range(self, client):
+        response = client.get("/media/music/track one.mp3", headers={"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.content == bytes(range(10, 20))
+        assert response.headers["content-range"] == "bytes 10-19/1000"
+
+    def test_suffix_range(self, client):
+        response = client.get("/media/music/track one.mp3", headers={"Range": "bytes=-4"})
+
+        assert response.status_code == 206
+        assert response.content == bytes(range(246, 250))
+
+    def test_unsatisfiable_range(self, client):
+        response = client.get("/media/music/track one.mp3", headers={"Range": "bytes=5000-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */1000"
+
+    def test_if_none_match(self, client):
+        etag = client.get("/media/music/track one.mp3").headers["etag"]
+
+        response = client.get("/media/music/track one.mp3", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_stale_if_range_sends_whole_file(self, client):
+        response = client.get(
+            "/media/music/track one.mp3", headers={"Range": "bytes=0-9", "If-Range": '"old"'}
+        )
+
+        assert response.status_code == 200
+        assert len(response.content) == 1000
+
+    def test_path_traversal_refused(self, client):
+        assert client.get("/media/../secret.txt").status_code == 404
+        assert client.get("/media/music/..%2F..%2Fsecret.txt").status_code == 404
+
+
+class TestManifest:
+    """Test the per-category prefetch manifest."""
+
+    def test_versioned_url_is_immutable(self, client, monkeypatch):
+        questions = [
+            {"id": "m1", "type": "music", "audio_file": "track one.mp3"},
+            {"id": "m2", "type": "music", "audio_file": "missing.mp3"},
+            {"id": "t1", "question": "Not music"},
+        ]
+        monkeypatch.setattr("main.get_question_store", lambda: FakeStore(questions))
+
+        manifest = client.get("/api/media/manifest", params={"category": "Music"}).json()["Music"]
+
+        assert [entry["question_id"] for entry in manifest] == ["m1", "m2"]
+        assert manifest[0]["size"] == 1000
+        assert manifest[1]["available"] == False
+        response = client.get(manifest[0]["url"])
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_unknown_category(self, client):
+        assert client.get("/api/media/manifest", params={"category": "Nope"}).status_code == 404
+
+
+class FakeStore:
+    def __init__(self, questions):
+        self._questions = questions
+
+    def categories(self):
+        return [{"name": "Music", "count": len(self._questions)}]
+
+    def questions(self, category, offset=0, limit=100):
+        return self._questions[offset:offset + limit]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Tests for the /metrics instrumentation.
+Run with: pytest test_metrics.py -v
+"""
+
+import pytest
+
+import metrics
+from main import dispatch_message, handle_player_message
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room where Bob's socket is broken."""
+    room_with_players.players["player2"]["ws"].send_json.side_effect = RuntimeError("socket closed")
+    return room_with_players
+
+
+class TestInstrumentation:
+    """Test that room traffic is recorded."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_records_traffic_and_failures(self, room_with_players):
+        """Successful sends and swallowed failures are both counted."""
+        room = room_with_players
+        sent_before = metrics.messages_out.value("player", "metrics_probe")
+        failed_before = metrics.send_failures.value("player", "metrics_probe")
+        broadcasts_before = metrics.broadcast_seconds.count("all", "metrics_probe")
+
+        await room.broadcast_to_all({"type": "metrics_probe"})
+
+        assert metrics.messages_out.value("player", "metrics_probe") == sent_before + 2
+        assert metrics.send_failures.value("player", "metrics_probe") == failed_before + 1
+        assert metrics.broadcast_seconds.count("all", "metrics_probe") == broadcasts_before + 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_message_type_does_not_raise(self, room_with_players):
+        """A non-string type from a client is counted as "other" and ignored."""
+        room = room_with_players
+        before = metrics.messages_in.value("player", "other")
+
+        for bad_type in ([], {}):
+            data = {"type": bad_type}
+            await dispatch_message(room, "player", data, lambda: handle_player_message(room, "player1", data), "player1")
+
+        assert metrics.messages_in.value("player", "other") == before + 2
+        assert room.players["player1"]["connected"]
+
+
+class TestExposition:
+    """Test the Prometheus text format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("test_seconds", "Test", buckets=(0.1, 1.0))
+        histogram.observe(value=0.05)
+        histogram.observe(value=0.5)
+        histogram.observe(value=5)
+
+        lines = histogram.render()
+
+        assert 'test_seconds_bucket{le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{le="1.0"} 2' in lines
+        assert 'test_seconds_bucket{le="+Inf"} 3' in lines
+        assert "test_seconds_count 3" in lines
+
+    def test_label_cardinality_is_capped(self):
+        counter = metrics.Counter("test_total", "Test", ("type",))
+        for i in range(metrics.MAX_SERIES + 10):
+            counter.inc(f"type{i}")
+
+        assert len(counter.series) == metrics.MAX_SERIES + 1
+        assert counter.value("other") == 10
+
+    def test_non_string_labels_folded(self):
+        counter = metrics.Counter("test_total", "Test", ("type",))
+        for value in ([], {}, None, 5):
+            counter.inc(value)
+
+        assert counter.series == {("other",): 4}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for the opt-in profiler.
+Run with: pytest test_profiler.py -v
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import logging
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from profiler import Profiler
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.enabled = True
+    profiler.slow_threshold = 0.01
+    return profiler
+
+
+class TestSlowCallLogging:
+    """Test slow handler reporting."""
+
+    def test_slow_call_logged_with_room_and_type(self, profiler, caplog):
+        with caplog.at_level(logging.WARNING, logger="quiznight.profiler"):
+            profiler.report("host_message", "room-1", "reveal_answer", 0.25)
+
+        assert "room=room-1" in caplog.text
+        assert "type=reveal_answer" in caplog.text
+
+    def test_fast_call_not_logged(self, profiler, caplog):
+        with caplog.at_level(logging.WARNING, logger="quiznight.profiler"):
+            profiler.report("host_message", "room-1", "reveal_answer", 0.001)
+
+        assert caplog.text == ""
+
+    def test_disabled_profiler_logs_nothing(self, profiler, caplog):
+        profiler.enabled = False
+        with caplog.at_level(logging.WARNING, logger="quiznight.profiler"):
+            with profiler.track("host_message", "room-1", "reveal_answer"):
+                time.sleep(0.02)
+
+        assert caplog.text == ""
+
+
+class TestSampling:
+    """Test the folded-stack sampler."""
+
+    @pytest.mark.asyncio
+    async def test_samples_only_profiled_handlers(self, profiler):
+        def handle_host_message():
+            started = time.perf_counter()
+            while time.perf_counter() - started < 0.1:
+                pass
+
+        capture = asyncio.create_task(profiler.sample_stacks(0.3, interval=0.002))
+        await asyncio.sleep(0.02)
+        handle_host_message()
+        folded = await capture
+
+        assert folded
+        for line in folded.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert "handle_host_message" in stack
+            assert int(count) > 0
+
+
+class TestSettings:
+    """Test that .env is read before the profiler reads its settings."""
+
+    def test_env_file_reaches_import_time_settings(self, tmp_path):
+        for source in Path(__file__).parent.glob("*.py"):
+            if not source.name.startswith("test_"):
+                shutil.copy(source, tmp_path)
+        (tmp_path / ".env").write_text("PROFILING=1\nPROFILING_SLOW_MS=123\n")
+        env = {key: value for key, value in os.environ.items() if key not in ("PROFILING", "PROFILING_SLOW_MS")}
+
+        result = subprocess.run(
+            [sys.executable, "-c", "import main; print(main.profiler.enabled, main.profiler.slow_threshold)"],
+            cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.split()[-2:] == ["True", "0.123"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
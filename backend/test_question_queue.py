@@ -0,0 +1,160 @@
+"""
+Tests for queued questions and auto-advance.
+Run with: pytest test_question_queue.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from main import handle_host_message
+
+QUESTIONS = [
+    {"id": f"q{i}", "question": f"Question {i}?", "options": ["A1", "B1", "C1", "D1"],
+     "correct_answer": "A1", "points": 100}
+    for i in range(1, 4)
+]
+
+
+class FakeStore:
+    def get(self, question_id):
+        return next((q for q in QUESTIONS if q["id"] == question_id), None)
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room on a fake catalog, past the mini-game."""
+    room_with_players.question_store = FakeStore()
+    room_with_players.mini_game_active = False
+    return room_with_players
+
+
+def sent(ws):
+    """Every frame sent on a mock socket, whether encoded ahead of time or not"""
+    frames = []
+    for name, args, _ in ws.method_calls:
+        if name == "send_json":
+            frames.append(args[0])
+        elif name == "send_text":
+            frames.append(json.loads(args[0]))
+    return frames
+
+
+class TestQuestionQueue:
+    """Test queueing questions and id-only starts."""
+
+    @pytest.mark.asyncio
+    async def test_queue_by_id_and_report_missing(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "nope", QUESTIONS[2]]})
+
+        update = sent(room.host_ws)[-1]
+        assert update["type"] == "question_queue_updated"
+        assert update["queue"] == ["q1", "q3"]
+        assert update["missing"] == ["nope"]
+
+    @pytest.mark.asyncio
+    async def test_empty_start_uses_pre_encoded_frames(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2"]})
+        room.host_ws.reset_mock()
+
+        await handle_host_message(room, {"type": "start_question"})
+
+        assert room.current_question == QUESTIONS[0]
+        assert room.question_active
+        room.players["player1"]["ws"].send_json.assert_not_called()
+        assert sent(room.players["player1"]["ws"]) == [{"type": "question_started", "timer": 15}]
+        host_frames = sent(room.host_ws)
+        assert host_frames[0] == {"type": "question_started", "question": QUESTIONS[0], "timer": 15}
+        assert host_frames[1]["queue"] == ["q2"]
+
+    @pytest.mark.asyncio
+    async def test_start_by_id_takes_it_out_of_the_queue(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2", "q3"]})
+
+        await handle_host_message(room, {"type": "start_question", "question_id": "q2"})
+
+        assert room.current_question == QUESTIONS[1]
+        assert room.get_queue_state()["queue"] == ["q1", "q3"]
+
+    @pytest.mark.asyncio
+    async def test_full_question_start_reports_dequeued_entry(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2"]})
+        room.host_ws.reset_mock()
+
+        await handle_host_message(room, {"type": "start_question", "question": QUESTIONS[1]})
+
+        assert room.current_question == QUESTIONS[1]
+        assert sent(room.host_ws)[-1] == {"type": "question_queue_updated", **room.get_queue_state()}
+        assert sent(room.host_ws)[-1]["queue"] == ["q1"]
+
+    @pytest.mark.asyncio
+    async def test_timer_change_reencodes_queue(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1"]})
+        await handle_host_message(room, {"type": "set_timer", "seconds": 30})
+
+        await handle_host_message(room, {"type": "start_question"})
+
+        assert sent(room.players["player2"]["ws"]) == [{"type": "question_started", "timer": 30}]
+
+    @pytest.mark.asyncio
+    async def test_replace_queue(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2"]})
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q3"], "replace": True})
+
+        assert room.get_queue_state()["queue"] == ["q3"]
+
+
+class TestAutoAdvance:
+    """Test moving on to the next queued question after a reveal."""
+
+    @pytest.mark.asyncio
+    async def test_reveal_schedules_next_question(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "set_auto_advance", "enabled": True, "pause_seconds": 0.01})
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2"]})
+        await handle_host_message(room, {"type": "start_question"})
+
+        await handle_host_message(room, {"type": "reveal_answer"})
+        revealed = [f for f in sent(room.host_ws) if f["type"] == "answer_revealed"][0]
+        assert revealed["next_question_in"] == 0.01
+
+        await room.advance_task
+        assert room.current_question == QUESTIONS[1]
+        assert room.question_active
+
+    @pytest.mark.asyncio
+    async def test_next_question_cancels_auto_advance(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "set_auto_advance", "enabled": True, "pause_seconds": 0.01})
+        await handle_host_message(room, {"type": "queue_questions", "questions": ["q1", "q2"]})
+        await handle_host_message(room, {"type": "start_question"})
+        await handle_host_message(room, {"type": "reveal_answer"})
+
+        await handle_host_message(room, {"type": "next_question"})
+        await asyncio.sleep(0.03)
+
+        assert room.current_question is None
+        assert room.get_queue_state()["queue"] == ["q2"]
+
+    @pytest.mark.asyncio
+    async def test_no_auto_advance_without_queue(self, room_with_players):
+        room = room_with_players
+        await handle_host_message(room, {"type": "set_auto_advance", "enabled": True})
+        await handle_host_message(room, {"type": "start_question", "question": QUESTIONS[0]})
+
+        await handle_host_message(room, {"type": "reveal_answer"})
+
+        assert room.advance_task is None
+        revealed = [f for f in sent(room.host_ws) if f["type"] == "answer_revealed"][0]
+        assert revealed["next_question_in"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,170 @@
+"""
+Tests for the question stores, streaming importer and compiled catalog.
+Run with: pytest test_question_store.py -v
+"""
+
+import json
+import threading
+import time
+import pytest
+from unittest.mock import AsyncMock
+
+import question_store
+from main import GameRoom, handle_host_message
+from question_store import (
+    QUESTIONS_FILE, JsonQuestionStore, SqliteQuestionStore, compile_catalog, import_json, iter_json_questions
+)
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({
+        "categories": {
+            "Science": [
+                {"id": "sci1", "question": "What is H2O?", "options": ["Water", "Salt"], "correct_answer": "Water", "points": 100},
+                {"id": "sci2", "question": "Closest star?", "options": ["Sun", "Vega"], "correct_answer": "Sun", "points": 200},
+            ],
+            "Música": [
+                {"id": "mus1", "question": "¿Quién cantó Macarena?", "options": ["Los del Río", "Mecano"], "correct_answer": "Los del Río", "points": 150},
+            ],
+        }
+    }))
+    return path
+
+
+@pytest.fixture
+def store(bank, tmp_path):
+    db_path = tmp_path / "bank.db"
+    import_json(bank, db_path)
+    return SqliteQuestionStore(str(db_path))
+
+
+class TestImporter:
+    """Test streaming the JSON bank."""
+
+    def test_stream_matches_full_parse(self):
+        """Streaming with tiny chunks yields exactly what json.load sees."""
+        expected = [
+            (category, i, q)
+            for category, questions in json.loads(QUESTIONS_FILE.read_text())["categories"].items()
+            for i, q in enumerate(questions)
+        ]
+
+        assert list(iter_json_questions(QUESTIONS_FILE, chunk_size=7)) == expected
+
+    def test_reimport_replaces_questions(self, bank, tmp_path):
+        db_path = tmp_path / "bank.db"
+        import_json(bank, db_path)
+        import_json(bank, db_path)
+
+        store = SqliteQuestionStore(str(db_path))
+        assert sum(c["count"] for c in store.categories()) == 3
+        assert [q["id"] for q in store.search("water")] == ["sci1"]
+
+
+class TestSqliteStore:
+    """Test indexed lookups and search."""
+
+    def test_categories_in_file_order(self, store):
+        assert store.categories() == [{"name": "Science", "count": 2}, {"name": "Música", "count": 1}]
+
+    def test_category_paging(self, store):
+        assert [q["id"] for q in store.questions("Science", offset=1, limit=1)] == ["sci2"]
+
+    def test_get_by_id(self, store):
+        assert store.get("mus1")["points"] == 150
+        assert store.get("missing") is None
+
+    def test_search_ignores_accents_and_case(self, store):
+        assert [q["id"] for q in store.search("quien MACARENA")] == ["mus1"]
+
+    def test_search_input_is_not_fts_syntax(self, store):
+        assert store.search('sun" OR "water') == []
+
+    def test_encoded_cached_until_database_changes(self, store, bank, tmp_path):
+        first = store.encoded()
+        assert json.loads(first) == store.all()
+        assert store.encoded() is first
+
+        data = json.loads(bank.read_text())
+        data["categories"]["Science"].append({"id": "sci3", "question": "Red planet?", "points": 100})
+        bank.write_text(json.dumps(data))
+        import_json(bank, tmp_path / "bank.db")
+
+        assert [q["id"] for q in json.loads(store.encoded())["categories"]["Science"]] == ["sci1", "sci2", "sci3"]
+
+
+class TestCompiledCatalog:
+    """Test the precompiled snapshot of a JSON bank."""
+
+    def test_loads_from_snapshot(self, bank, tmp_path):
+        assert compile_catalog(bank, tmp_path / "bank.bin") == 3
+
+        store = JsonQuestionStore(bank)
+
+        assert store.all() == json.loads(bank.read_text())
+        assert store.compiled
+        assert json.loads(store.encoded()) == json.loads(bank.read_text())
+        assert store.get("mus1")["correct_answer"] == "Los del Río"
+        assert store.get("missing") is None
+
+    def test_stale_snapshot_ignored(self, bank, tmp_path):
+        compile_catalog(bank, tmp_path / "bank.bin")
+        data = json.loads(bank.read_text())
+        data["categories"]["Science"].pop()
+        bank.write_text(json.dumps(data))
+
+        store = JsonQuestionStore(bank)
+
+        assert not store.compiled
+        assert store.get("sci2") is None
+        assert json.loads(store.encoded()) == data
+
+    def test_corrupt_snapshot_ignored(self, bank, tmp_path):
+        (tmp_path / "bank.bin").write_bytes(b"not marshal")
+
+        store = JsonQuestionStore(bank)
+
+        assert store.get("sci1")["points"] == 100
+        assert not store.compiled
+
+    def test_concurrent_loads_read_file_once(self, bank, monkeypatch):
+        loads = []
+        real_load = question_store.load_compiled
+
+        def slow_load(*args):
+            loads.append(args)
+            time.sleep(0.05)
+            return real_load(*args)
+
+        monkeypatch.setattr(question_store, "load_compiled", slow_load)
+        store = JsonQuestionStore(bank)
+        threads = [threading.Thread(target=store.preload) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        assert store.get("sci2")["points"] == 200
+        for thread in threads:
+            thread.join()
+
+        assert len(loads) == 1
+
+
+class TestLazyQuestions:
+    """Test rooms fetching questions from the store."""
+
+    @pytest.mark.asyncio
+    async def test_start_question_by_id(self, store):
+        room = GameRoom("test-room", "Test Host")
+        room.host_ws = AsyncMock()
+        room.mini_game_active = False
+        room.question_store = store
+
+        await handle_host_message(room, {"type": "start_question", "question_id": "sci2"})
+
+        assert room.current_question["correct_answer"] == "Sun"
+        room.timer_task.cancel()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Tests for room codes and room lifecycle.
+Run with: pytest test_rooms.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app, rooms, room_codes, close_room, RoomCodeRegistry
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+class TestRoomCodes:
+    """Test short-code allocation and lookup."""
+
+    def test_join_by_code_case_insensitive(self, client):
+        created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+
+        response = client.get(f"/api/rooms/{created['room_code'].lower()}")
+
+        assert response.status_code == 200
+        assert response.json()["room_id"] == created["room_id"]
+
+    def test_player_socket_accepts_code(self, client):
+        created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+
+        with client.websocket_connect(f"/ws/player/{created['room_code']}/Alice") as ws:
+            init = ws.receive_json()
+
+        assert init["type"] == "init"
+        assert len(rooms[created["room_id"]].players) == 1
+
+    def test_colliding_prefix_gets_fresh_code(self):
+        registry = RoomCodeRegistry()
+
+        first = registry.allocate("abcdef00-0000")
+        second = registry.allocate("abcdef11-1111")
+
+        assert first == "ABCDEF"
+        assert second != first
+        assert registry.lookup(second) == "abcdef11-1111"
+
+    def test_closed_room_releases_code(self, client):
+        created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+
+        close_room(rooms[created["room_id"]])
+
+        assert room_codes.lookup(created["room_code"]) is None
+        assert client.get(f"/api/rooms/{created['room_code']}").status_code == 404
+
+
+class TestRoomExpiry:
+    """Test idle rooms being reclaimed."""
+
+    def test_idle_room_expires(self, client, monkeypatch):
+        created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+
+        with client.websocket_connect(f"/ws/host/{created['room_id']}") as ws:
+            ws.receive_json()
+            monkeypatch.setattr(main, "ROOM_IDLE_TIMEOUT", 0)
+        # Any round trip through the app lets the expiry task run
+        client.get("/")
+        client.get("/")
+
+        assert created["room_id"] not in rooms
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Tests for the read-only spectator feed.
+Run with: pytest test_spectators.py -v
+"""
+
+import json
+import time
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app, handle_host_message
+from spectators import SpectatorHub
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room with unthrottled spectator frames."""
+    room_with_players.spectators.throttle = 0
+    return room_with_players
+
+
+class TestSpectatorHub:
+    """Test conflation and filtering in the fan-out tier."""
+
+    @pytest.mark.asyncio
+    async def test_only_latest_frame_per_channel_delivered(self):
+        hub = SpectatorHub(throttle=0.05)
+        feed = hub.subscribe({})
+
+        for remaining in (3, 2, 1):
+            hub.publish({"type": "timer_tick", "remaining": remaining})
+        await asyncio.sleep(0.01)
+        frames = await feed.next(timeout=1)
+
+        assert [json.loads(data) for _, data in frames] == [{"type": "timer_tick", "remaining": 1}]
+        hub.close()
+
+    @pytest.mark.asyncio
+    async def test_private_frames_not_forwarded(self):
+        hub = SpectatorHub(throttle=0)
+        feed = hub.subscribe({})
+
+        hub.publish({"type": "answer_count_update", "count": 1, "total_players": 2})
+        frames = await feed.next(timeout=0.05)
+
+        assert frames == []
+        hub.close()
+
+    @pytest.mark.asyncio
+    async def test_room_broadcast_reaches_spectators(self, room_with_players):
+        room = room_with_players
+        feed = room.spectators.subscribe({})
+
+        await handle_host_message(room, {"type": "award_points", "player_id": "player1", "points": 50})
+        await asyncio.sleep(0)
+        frames = await feed.next(timeout=1)
+
+        event, data = frames[0]
+        assert event == "leaderboard_update"
+        assert json.loads(data)["leaderboard"][0]["score"] == 50
+        room.spectators.close()
+
+
+class TestSpectatorEndpoint:
+    """Test the WebSocket spectator endpoint."""
+
+    def test_spectator_gets_snapshot(self):
+        with TestClient(app) as client:
+            created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+            with client.websocket_connect(f"/ws/player/{created['room_code']}/Alice") as player:
+                player.receive_json()
+                with client.websocket_connect(f"/ws/spectate/{created['room_code']}") as spectator:
+                    frames = [spectator.receive_json(), spectator.receive_json()]
+
+        types = {frame["type"] for frame in frames}
+        assert types == {"leaderboard_update", "mini_game_update"}
+        leaderboard = next(f for f in frames if f["type"] == "leaderboard_update")["leaderboard"]
+        assert leaderboard[0]["name"] == "Alice"
+
+    def test_unexpected_frame_ends_feed(self):
+        """A binary frame can't be read as text; the feed is dropped rather than left subscribed."""
+        with TestClient(app) as client:
+            created = client.post("/api/rooms", json={"host_name": "Host"}).json()
+            room = main.rooms[created["room_id"]]
+            with client.websocket_connect(f"/ws/spectate/{created['room_code']}") as spectator:
+                spectator.receive_json()
+                spectator.send_bytes(b"\x00")
+                deadline = time.monotonic() + 2
+                while room.spectators.feeds and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                assert room.spectators.feeds == set()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
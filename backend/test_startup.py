@@ -0,0 +1,29 @@
+"""
+Tests for the cold-start timing report.
+Run with: pytest test_startup.py -v
+"""
+
+import startup
+
+
+class TestStartupReport:
+    """Test phase and milestone recording."""
+
+    def test_main_boot_phases_recorded(self):
+        import main
+
+        phases = startup.report()["phases_ms"]
+        assert list(phases)[:4] == ["framework imports", "settings", "app imports", "app and routes"]
+        assert all(ms >= 0 for ms in phases.values())
+
+    def test_milestone_kept_from_first_call(self):
+        startup.milestone("test milestone")
+        first = startup.milestones["test milestone"]
+
+        startup.milestone("test milestone")
+
+        assert startup.milestones["test milestone"] == first
+        assert "test milestone" in startup.report()["milestones_ms"]
+
+    def test_summary(self):
+        assert startup.summary().startswith("Startup: ")
@@ -0,0 +1,147 @@
+"""
+Tests for multi-room tournaments.
+Run with: pytest test_tournament.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+
+import main
+from main import GameRoom, app, handle_host_message
+from tournament import Tournament
+
+
+def make_room(room_id, scores):
+    room = GameRoom(room_id, "Host")
+    room.host_ws = AsyncMock()
+    room.players = {
+        player_id: {"name": name, "score": score, "ws": AsyncMock(), "connected": True}
+        for player_id, (name, score) in scores.items()
+    }
+    return room
+
+
+def standings_frames(room):
+    return [json.loads(c[0][0]) for c in room.host_ws.send_text.call_args_list
+            if json.loads(c[0][0])["type"] == "global_standings"]
+
+
+@pytest_asyncio.fixture
+async def tournament():
+    """Two tables in one tournament, with no throttle."""
+    tournament = Tournament("t1", "Pub League", throttle=0.01)
+    table1 = make_room("room-1", {"a": ("Alice", 100), "b": ("Bob", 40)})
+    table2 = make_room("room-2", {"c": ("Cara", 70)})
+    tournament.add_room(table1)
+    tournament.add_room(table2)
+    yield tournament, table1, table2
+    tournament.flusher.cancel()
+
+
+class TestRanking:
+    """Test the merged ranking."""
+
+    @pytest.mark.asyncio
+    async def test_merged_across_rooms(self, tournament):
+        tournament, _, _ = tournament
+
+        standings = tournament.get_standings()
+
+        assert [(p["name"], p["score"], p["position"]) for p in standings] == [
+            ("Alice", 100, 1), ("Cara", 70, 2), ("Bob", 40, 3)
+        ]
+        assert standings[1]["room_id"] == "room-2"
+
+    @pytest.mark.asyncio
+    async def test_score_change_repositions_player(self, tournament):
+        tournament, table1, _ = tournament
+
+        await handle_host_message(table1, {"type": "award_points", "player_id": "b", "points": 100})
+
+        assert [p["name"] for p in tournament.get_standings()] == ["Bob", "Alice", "Cara"]
+        assert len(tournament.ranking) == 3
+
+    @pytest.mark.asyncio
+    async def test_kicked_player_leaves_standings(self, tournament):
+        tournament, table1, _ = tournament
+
+        await handle_host_message(table1, {"type": "kick_player", "player_id": "a"})
+
+        assert [p["name"] for p in tournament.get_standings()] == ["Cara", "Bob"]
+
+    @pytest.mark.asyncio
+    async def test_remove_room(self, tournament):
+        tournament, _, table2 = tournament
+
+        tournament.remove_room("room-2")
+
+        assert [p["name"] for p in tournament.get_standings()] == ["Alice", "Bob"]
+        assert table2.tournament is None
+
+
+class TestStandingsBroadcast:
+    """Test throttled global_standings frames."""
+
+    @pytest.mark.asyncio
+    async def test_every_host_gets_standings(self, tournament):
+        tournament, table1, table2 = tournament
+        await asyncio.sleep(0)
+
+        for table in (table1, table2):
+            frames = standings_frames(table)
+            assert len(frames) == 1
+            assert frames[0]["total_players"] == 3
+            assert table.spectators.latest["tournament"]["type"] == "global_standings"
+
+    @pytest.mark.asyncio
+    async def test_bursts_are_coalesced(self, tournament):
+        tournament, table1, table2 = tournament
+        await asyncio.sleep(0)
+
+        for _ in range(5):
+            await handle_host_message(table1, {"type": "award_points", "player_id": "b", "points": 10})
+        await asyncio.sleep(0.05)
+
+        frames = standings_frames(table2)
+        assert len(frames) == 2
+        assert frames[-1]["standings"][2] == {
+            "position": 3, "player_id": "c", "name": "Cara", "room_id": "room-2",
+            "room_code": table2.room_code, "score": 70
+        }
+        assert frames[-1]["standings"][1]["score"] == 90
+
+
+class TestTournamentEndpoints:
+    """Test creating tournaments and entering rooms."""
+
+    def test_create_rooms_in_tournament(self):
+        client = TestClient(app)
+        tournament_id = client.post("/api/tournaments", json={"name": "Quiz League"}).json()["tournament_id"]
+
+        room_id = client.post("/api/rooms", json={"host_name": "A", "tournament_id": tournament_id}).json()["room_id"]
+        other = client.post("/api/rooms", json={"host_name": "B"}).json()
+        added = client.post(f"/api/tournaments/{tournament_id}/rooms", json={"room_id": other["room_code"]})
+
+        assert added.status_code == 200
+        body = client.get(f"/api/tournaments/{tournament_id}").json()
+        assert {r["room_id"] for r in body["rooms"]} == {room_id, other["room_id"]}
+        assert body["standings"] == []
+
+        removed = client.delete(f"/api/tournaments/{tournament_id}/rooms/{room_id}")
+        assert removed.status_code == 200
+        assert main.rooms[room_id].tournament is None
+
+    def test_unknown_tournament(self):
+        client = TestClient(app)
+
+        assert client.get("/api/tournaments/nope").status_code == 404
+        assert client.post("/api/rooms", json={"host_name": "A", "tournament_id": "nope"}).status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,142 @@
+"""
+Tests for optional end-to-end latency tracing.
+Run with: pytest test_tracing.py -v
+"""
+
+import pytest
+from collections import deque
+from fastapi.testclient import TestClient
+
+import main
+from main import dispatch_message, handle_player_message
+
+
+@pytest.fixture
+def room_with_players(room_with_players):
+    """Shared room with tracing on."""
+    room_with_players.tracer.enabled = True
+    return room_with_players
+
+
+class TestStamping:
+    """Test outbound frame stamping."""
+
+    @pytest.mark.asyncio
+    async def test_frames_untouched_when_tracing_off(self, room_with_players):
+        room = room_with_players
+        room.tracer.enabled = False
+
+        await room.send_to_host({"type": "timer_updated", "seconds": 10})
+
+        assert room.host_ws.send_json.call_args[0][0] == {"type": "timer_updated", "seconds": 10}
+
+    @pytest.mark.asyncio
+    async def test_untraced_broadcast_skips_recipient_list(self, room_with_players):
+        room = room_with_players
+        room.tracer.enabled = False
+        room.connected_recipients = lambda include_host=False: pytest.fail("built recipients with tracing off")
+
+        await room.broadcast_to_all({"type": "buzzer_locked"})
+        await room.broadcast_to_players({"type": "question_cleared"})
+
+        assert room.players["player1"]["ws"].send_json.call_args[0][0] == {"type": "question_cleared"}
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_seq(self, room_with_players):
+        room = room_with_players
+        await room.broadcast_to_all({"type": "buzzer_locked"})
+
+        host_frame = room.host_ws.send_json.call_args[0][0]
+        player_frame = room.players["player1"]["ws"].send_json.call_args[0][0]
+        assert host_frame["seq"] == player_frame["seq"]
+        assert "server_ts" in host_frame
+
+    @pytest.mark.asyncio
+    async def test_frames_carry_causing_trace_id(self, room_with_players):
+        room = room_with_players
+        room.question_active = True
+        data = {"type": "submit_answer", "answer": "A", "trace_id": "tap-1"}
+
+        await dispatch_message(room, "player", data, lambda: handle_player_message(room, "player1", data))
+
+        host_frame = room.host_ws.send_json.call_args[0][0]
+        assert host_frame["type"] == "answer_count_update"
+        assert host_frame["trace_id"] == "tap-1"
+        assert "cause_ts" in host_frame
+
+
+class TestAcks:
+    """Test latency aggregation from client acks."""
+
+    @pytest.mark.asyncio
+    async def test_ack_records_delivery_and_end_to_end(self, room_with_players):
+        room = room_with_players
+        room.question_active = True
+        data = {"type": "submit_answer", "answer": "A"}
+        await dispatch_message(room, "player", data, lambda: handle_player_message(room, "player1", data))
+        seq = room.host_ws.send_json.call_args[0][0]["seq"]
+
+        await dispatch_message(room, "host", {"type": "ack", "seq": seq}, None)
+
+        summary = room.tracer.summary()
+        assert summary["answer_count_update"]["delivery"]["count"] == 1
+        assert summary["answer_count_update"]["end_to_end"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fan_out_completes_on_last_ack(self, room_with_players):
+        room = room_with_players
+        data = {"type": "reveal_answer"}
+        await dispatch_message(room, "host", data, lambda: room.broadcast_to_all({"type": "answer_revealed"}))
+        seq = room.host_ws.send_json.call_args[0][0]["seq"]
+
+        await dispatch_message(room, "host", {"type": "ack", "seq": seq}, None)
+        await dispatch_message(room, "player", {"type": "ack", "seq": seq}, None, "player1")
+        await dispatch_message(room, "player", {"type": "ack", "seq": seq}, None, "player1")
+        await dispatch_message(room, "player", {"type": "ack", "seq": seq}, None, "player2")
+        assert "fan_out" not in room.tracer.summary()["answer_revealed"]
+
+        await dispatch_message(room, "player", {"type": "ack", "seq": seq}, None, "player3")
+
+        summary = room.tracer.summary()["answer_revealed"]
+        assert summary["delivery"]["count"] == 4  # the repeated ack isn't counted
+        assert summary["fan_out"]["count"] == 1
+        assert summary["end_to_end_fan_out"]["count"] == 1
+        assert set(room.tracer.recipient_summary()) == {None, "player1", "player2", "player3"}
+
+    @pytest.mark.asyncio
+    async def test_failed_send_does_not_hold_up_fan_out(self, room_with_players):
+        room = room_with_players
+        room.players["player3"]["ws"].send_json.side_effect = RuntimeError("socket closed")
+        await room.broadcast_to_players({"type": "question_cleared"})
+        seq = room.players["player1"]["ws"].send_json.call_args[0][0]["seq"]
+
+        for player_id in ("player1", "player2"):
+            await dispatch_message(room, "player", {"type": "ack", "seq": seq}, None, player_id)
+
+        assert room.tracer.summary()["question_cleared"]["fan_out"]["count"] == 1
+
+    def test_latency_lists_recipients_slowest_first(self, room_with_players):
+        room = room_with_players
+        room.tracer.recipient_samples = {"player1": deque([5.0]), "player2": deque([80.0]), None: deque([20.0])}
+        room.players["player2"]["rtt_ms"] = 60.0
+        main.rooms[room.room_id] = room
+        try:
+            response = TestClient(main.app).get(f"/api/rooms/{room.room_id}/latency")
+        finally:
+            main.rooms.pop(room.room_id)
+
+        recipients = response.json()["recipients"]
+        assert [r["player_id"] for r in recipients] == ["player2", None, "player1", "player3"]
+        assert recipients[0]["rtt_ms"] == 60.0
+        assert recipients[-1]["delivery"] is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_ack_ignored(self, room_with_players):
+        room = room_with_players
+        await dispatch_message(room, "host", {"type": "ack", "seq": 999}, None)
+
+        assert room.tracer.summary() == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Tournaments: several rooms (one per table) sharing a global leaderboard.
+
+Each room reports its leaderboard whenever it broadcasts one. The tournament
+only repositions the players whose score changed, using bisect on a ranking
+kept sorted at all times, so an update never re-sorts players from other rooms.
+Global standings frames go to every participating host (and through them to
+their spectators) at most once per TOURNAMENT_THROTTLE_MS, encoded once.
+"""
+
+import asyncio
+import json
+import os
+from bisect import bisect_left, insort
+from typing import Optional
+
+TOURNAMENT_THROTTLE = float(os.getenv("TOURNAMENT_THROTTLE_MS", "1000")) / 1000
+
+# Players included in each global_standings frame
+STANDINGS_SIZE = 20
+
+
+class Tournament:
+    """Merged ranking across rooms with throttled standings broadcasts"""
+
+    def __init__(self, tournament_id: str, name: str, throttle: float = TOURNAMENT_THROTTLE):
+        self.tournament_id = tournament_id
+        self.name = name
+        self.throttle = throttle
+        self.rooms: dict = {}  # room_id -> GameRoom currently attached
+        self.room_codes: dict[str, str] = {}  # room_id -> join code, kept after the room closes
+        # Sorted (-score, name, room_id, player_id); ties rank alphabetically
+        self.ranking: list[tuple] = []
+        self.keys: dict[tuple[str, str], tuple] = {}  # (room_id, player_id) -> ranking entry
+        self.room_players: dict[str, set[str]] = {}
+        self.dirty = False
+        self.flusher: Optional[asyncio.Task] = None
+
+    def add_room(self, room):
+        """Attach a room and merge in its current leaderboard"""
+        self.rooms[room.room_id] = room
+        self.room_codes[room.room_id] = room.room_code
+        room.tournament = self
+        self.sync_room(room.room_id, room.get_leaderboard())
+
+    def detach_room(self, room):
+        """Stop sending frames to a room but keep its players in the standings"""
+        self.rooms.pop(room.room_id, None)
+        if room.tournament is self:
+            room.tournament = None
+
+    def remove_room(self, room_id: str):
+        """Take a room (open or closed) and all of its players out of the tournament"""
+        room = self.rooms.get(room_id)
+        if room:
+            self.detach_room(room)
+        for player_id in self.room_players.pop(room_id, set()):
+            self._remove(room_id, player_id)
+        self.room_codes.pop(room_id, None)
+        self._mark_dirty()
+
+    def _update(self, room_id: str, player_id: str, name: str, score) -> bool:
+        entry = (-score, name, room_id, player_id)
+        old = self.keys.get((room_id, player_id))
+        if old == entry:
+            return False
+        if old is not None:
+            del self.ranking[bisect_left(self.ranking, old)]
+        insort(self.ranking, entry)
+        self.keys[(room_id, player_id)] = entry
+        return True
+
+    def _remove(self, room_id: str, player_id: str):
+        old = self.keys.pop((room_id, player_id), None)
+        if old is not None:
+            del self.ranking[bisect_left(self.ranking, old)]
+
+    def sync_room(self, room_id: str, leaderboard: list[dict]):
+        """Apply one room's leaderboard, repositioning only changed players"""
+        changed = False
+        seen = set()
+        for player in leaderboard:
+            seen.add(player["id"])
+            changed |= self._update(room_id, player["id"], player["name"], player["score"])
+        for player_id in self.room_players.get(room_id, set()) - seen:
+            self._remove(room_id, player_id)
+            changed = True
+        self.room_players[room_id] = seen
+        if changed:
+            self._mark_dirty()
+
+    def get_standings(self, limit: Optional[int] = None) -> list[dict]:
+        entries = self.ranking if limit is None else self.ranking[:limit]
+        return [
+            {
+                "position": i + 1,
+                "player_id": player_id,
+                "name": name,
+                "room_id": room_id,
+                "room_code": self.room_codes.get(room_id),
+                "score": -negative_score
+            }
+            for i, (negative_score, name, room_id, player_id) in enumerate(entries)
+        ]
+
+    def get_frame(self) -> dict:
+        return {
+            "type": "global_standings",
+            "tournament_id": self.tournament_id,
+            "name": self.name,
+            "standings": self.get_standings(STANDINGS_SIZE),
+            "total_players": len(self.ranking),
+            "rooms": len(self.room_codes)
+        }
+
+    def _mark_dirty(self):
+        self.dirty = True
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        # Leading edge goes out right away; later changes wait out the throttle
+        while self.dirty:
+            self.dirty = False
+            frame = self.get_frame()
+            encoded = json.dumps(frame)
+            for room in list(self.rooms.values()):
+                await room.send_encoded_to_host(frame, encoded)
+            await asyncio.sleep(self.throttle)
@@ -0,0 +1,154 @@
+"""
+Optional end-to-end latency tracing for room traffic.
+
+When tracing is on for a room, every outbound frame is stamped with a `seq`,
+the monotonic `server_ts` it was sent at and, if it was caused by an inbound
+frame, that frame's `trace_id` and receive time (`cause_ts`). Clients echo
+{"type": "ack", "seq": ...} and the room records, per message type:
+
+  delivery            frame sent -> ack received (includes the ack's return leg)
+  end_to_end          causing frame received -> ack received, e.g. a player's
+                      submit_answer until the host has acked answer_count_update
+  fan_out             frame sent -> last recipient's ack
+  end_to_end_fan_out  causing frame received -> last recipient's ack, e.g. the
+                      host's reveal_answer until the last phone has acked
+                      answer_revealed
+
+Delivery is also kept per recipient (the host, or a player id) so slow phones
+stand out. A fan-out completes once every recipient has acked or its send has
+failed; frames to clients that vanish without acking simply expire.
+"""
+
+import itertools
+import os
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+# Rooms start with tracing on when TRACING=1, otherwise the host opts in
+TRACING_DEFAULT = os.getenv("TRACING", "").lower() in ("1", "true", "yes")
+
+# Samples kept per (message type, kind) and frames awaiting acks, per room
+MAX_SAMPLES = 2000
+MAX_PENDING = 4096
+
+# (trace_id, received_at) of the inbound frame currently being handled
+current_cause: ContextVar[Optional[tuple]] = ContextVar("current_cause", default=None)
+
+_trace_ids = itertools.count(1)
+
+
+def now_ms() -> float:
+    return round(time.monotonic() * 1000, 3)
+
+
+def new_trace_id() -> str:
+    return f"s{next(_trace_ids)}"
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def distribution(values: Iterable[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p90_ms": round(percentile(ordered, 90), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+class RoomTracer:
+    """Stamps outbound frames and aggregates ack latencies for one room"""
+
+    def __init__(self):
+        self.enabled = TRACING_DEFAULT
+        self.seq = itertools.count(1)
+        # seq -> {type, sent, cause, waiting: recipients yet to ack, last_ack}
+        self.pending: OrderedDict[int, dict] = OrderedDict()
+        self.samples: dict[tuple, deque] = {}  # (type, kind) -> latencies in ms
+        self.recipient_samples: dict[Optional[str], deque] = {}  # player_id (None = host) -> delivery ms
+
+    def stamp(self, message: dict, recipients: Iterable[Optional[str]] = ()) -> dict:
+        """
+        Return a stamped copy of an outbound frame (or the frame itself if off).
+        `recipients` are the player ids (None for the host) it is about to be sent to.
+        """
+        if not self.enabled:
+            return message
+        seq = next(self.seq)
+        sent = now_ms()
+        stamped = {**message, "seq": seq, "server_ts": sent}
+        cause = current_cause.get()
+        if cause:
+            stamped["trace_id"], stamped["cause_ts"] = cause
+        self.pending[seq] = {
+            "type": message.get("type"),
+            "sent": sent,
+            "cause": cause[1] if cause else None,
+            "waiting": set(recipients),
+            "last_ack": None,
+        }
+        if len(self.pending) > MAX_PENDING:
+            self.pending.popitem(last=False)
+        return stamped
+
+    def record_ack(self, data: dict, role: str, player_id: Optional[str] = None):
+        """Record latency for an acked frame; unknown, expired or repeated acks are ignored"""
+        seq = data.get("seq")
+        entry = self.pending.get(seq) if isinstance(seq, int) else None
+        recipient = None if role == "host" else player_id
+        if entry is None or recipient not in entry["waiting"]:
+            return
+        entry["waiting"].discard(recipient)
+        acked = now_ms()
+        entry["last_ack"] = acked
+        msg_type = entry["type"]
+        self._add(msg_type, "delivery", acked - entry["sent"])
+        if entry["cause"] is not None:
+            self._add(msg_type, "end_to_end", acked - entry["cause"])
+        if recipient not in self.recipient_samples:
+            self.recipient_samples[recipient] = deque(maxlen=MAX_SAMPLES)
+        self.recipient_samples[recipient].append(acked - entry["sent"])
+        if not entry["waiting"]:
+            self._complete(seq)
+
+    def abandon(self, seq, player_id: Optional[str]):
+        """Stop waiting on a recipient whose send failed"""
+        entry = self.pending.get(seq)
+        if entry is None:
+            return
+        entry["waiting"].discard(player_id)
+        if not entry["waiting"]:
+            self._complete(seq)
+
+    def _complete(self, seq: int):
+        entry = self.pending.pop(seq)
+        last_ack = entry["last_ack"]
+        if last_ack is None:
+            return  # Nobody acked
+        self._add(entry["type"], "fan_out", last_ack - entry["sent"])
+        if entry["cause"] is not None:
+            self._add(entry["type"], "end_to_end_fan_out", last_ack - entry["cause"])
+
+    def _add(self, msg_type, kind: str, value: float):
+        key = (msg_type, kind)
+        if key not in self.samples:
+            self.samples[key] = deque(maxlen=MAX_SAMPLES)
+        self.samples[key].append(value)
+
+    def summary(self) -> dict:
+        """Latency distributions in ms, grouped by message type"""
+        result: dict[str, dict] = {}
+        for (msg_type, kind), values in self.samples.items():
+            result.setdefault(str(msg_type), {})[kind] = distribution(values)
+        return result
+
+    def recipient_summary(self) -> dict[Optional[str], dict]:
+        """Delivery distribution per recipient, keyed by player id (None for the host)"""
+        return {recipient: distribution(values) for recipient, values in self.recipient_samples.items()}
@@ -5,7 +5,7 @@ import { useParams } from 'next/navigation';
 import { WS_URL, API_URL } from '@/lib/config';
 import { useWebSocket } from '@/hooks/useWebSocket';
 import { useSounds } from '@/hooks/useSounds';
-import type { Player, Question, BuzzEntry, WebSocketMessage, HostInitMessage, MiniGamePosition, ScoringResult } from '@/lib/types';
+import type { Player, Question, MediaManifestEntry, BuzzEntry, WebSocketMessage, HostInitMessage, MiniGamePosition, ScoringResult } from '@/lib/types';
 import Leaderboard from '@/components/Leaderboard';
 import BuzzerFeed from '@/components/BuzzerFeed';
 import BoatRace from '@/components/BoatRace';
@@ -29,6 +29,7 @@ export default function HostGame() {
   const [categories, setCategories] = useState<string[]>([]);
   const [currentCategory, setCurrentCategory] = useState<string | null>(null);
   const [questions, setQuestions] = useState<QuestionsData>({ categories: {} });
+  const [audioUrls, setAudioUrls] = useState<Record<string, string>>({});  // question id -> versioned audio URL
   const [currentQuestion, setCurrentQuestion] = useState<Question | null>(null);
   const [questionIndex, setQuestionIndex] = useState(0);
   const [buzzerQueue, setBuzzerQueue] = useState<BuzzEntry[]>([]);
@@ -207,6 +208,24 @@ export default function HostGame() {
     setCurrentCategory(category);
     setQuestionIndex(0);
     sendMessage({ type: 'select_category', category });
+    prefetchAudio(category);
+  };
+
+  // Warm the browser cache with the category's tracks; versioned URLs are cacheable forever
+  const prefetchAudio = (category: string) => {
+    fetch(`${API_URL}/api/media/manifest?category=${encodeURIComponent(category)}`)
+      .then((res) => (res.ok ? res.json() : {}))
+      .then((manifest: Record<string, MediaManifestEntry[]>) => {
+        const urls: Record<string, string> = {};
+        for (const entry of manifest[category] || []) {
+          if (!entry.available || !entry.url) continue;
+          urls[entry.question_id] = `${API_URL}${entry.url}`;
+          // Same request mode as the <audio> element, so it hits the same cache entry
+          fetch(urls[entry.question_id], { mode: 'no-cors' }).catch(() => {});
+        }
+        setAudioUrls((prev) => ({ ...prev, ...urls }));
+      })
+      .catch(console.error);
   };
 
   const startQuestion = () => {
@@ -224,6 +243,12 @@ export default function HostGame() {
     setScoringResults([]);
     setCorrectLetter(null);
     sendMessage({ type: 'start_question', question });
+    // Queue the rest of the category so each next question starts from frames the server already encoded
+    sendMessage({
+      type: 'queue_questions',
+      questions: categoryQuestions.slice(questionIndex + 1).map((q) => q.id),
+      replace: true,
+    });
     playSound('start');
   };
 
@@ -264,7 +289,7 @@ export default function HostGame() {
       setCurrentQuestion(nextQ);
       setBuzzerActive(true);
       setTotalPlayers(players.filter(p => p.connected).length);
-      sendMessage({ type: 'start_question', question: nextQ });
+      sendMessage({ type: 'start_question', question_id: nextQ.id });
       playSound('start');
     } else {
       // No more questions in category - go back to selection
@@ -454,6 +479,7 @@ export default function HostGame() {
           {currentQuestion && (
             <QuestionCard
               question={currentQuestion}
+              audioUrl={audioUrls[currentQuestion.id]}
               answerRevealed={answerRevealed}
               buzzerActive={buzzerActive}
               onStop={stopQuestion}
@@ -1,10 +1,12 @@
 'use client';
 
 import { useState, useRef, useEffect } from 'react';
+import { API_URL } from '@/lib/config';
 import type { Question } from '@/lib/types';
 
 interface QuestionCardProps {
   question: Question;
+  audioUrl?: string;  // versioned URL from the media manifest
   answerRevealed: boolean;
   buzzerActive: boolean;
   onStop: () => void;
@@ -16,6 +18,7 @@ const MAX_PLAY_SECONDS = 30;
 
 export default function QuestionCard({
   question,
+  audioUrl,
   answerRevealed,
   buzzerActive,
   onStop,
@@ -101,7 +104,7 @@ export default function QuestionCard({
         <div className="mb-6">
           <audio
             ref={audioRef}
-            src={`/music/${question.audio_file}`}
+            src={audioUrl ?? `${API_URL}/media/music/${encodeURIComponent(question.audio_file)}`}
             onTimeUpdate={handleTimeUpdate}
             onEnded={handleAudioEnded}
           />
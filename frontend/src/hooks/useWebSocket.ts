@@ -41,6 +41,15 @@ export function useWebSocket(url: string | null, options: UseWebSocketOptions =
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
+          // Answer heartbeats so the server doesn't reap this connection
+          if (data?.type === 'ping') {
+            ws.send(JSON.stringify({ type: 'pong', t: data.t }));
+            return;
+          }
+          // Echo trace acks so the server can measure delivery latency
+          if (typeof data?.seq === 'number') {
+            ws.send(JSON.stringify({ type: 'ack', seq: data.seq }));
+          }
           onMessage?.(data);
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e);
@@ -5,7 +5,18 @@ export interface Question {
   correct_answer: string;
   points: number;
   type?: 'text' | 'music';  // defaults to 'text' if not specified
-  audio_file?: string;       // filename in /music/ folder for music questions
+  audio_file?: string;       // filename in the backend's media/music/ folder for music questions
+}
+
+// One track from GET /api/media/manifest
+export interface MediaManifestEntry {
+  question_id: string;
+  audio_file: string;
+  available: boolean;
+  url?: string;              // backend path, versioned by content hash
+  size?: number;
+  etag?: string;
+  content_type?: string;
 }
 
 export interface Player {
@@ -34,6 +45,14 @@ export interface ScoringResult {
   points: number;
 }
 
+// Live per-option answer counts (host only during a question)
+export interface AnswerDistribution {
+  counts: Record<string, number>;
+  total: number;
+  correct_count: number;
+  first_correct: string | null;
+}
+
 // Mini-game types
 export interface MiniGamePosition {
   name: string;
@@ -72,6 +91,15 @@ export type PlayerInitMessage = {
   mini_game_active: boolean;
 };
 
+export interface GlobalStanding {
+  position: number;
+  player_id: string;
+  name: string;
+  room_id: string;
+  room_code: string | null;
+  score: number;
+}
+
 export type WebSocketMessage =
   | HostInitMessage
   | PlayerInitMessage
@@ -87,10 +115,14 @@ export type WebSocketMessage =
   | { type: 'player_buzzed'; buzz: BuzzEntry; buzzer_queue: BuzzEntry[] }  // deprecated for questions
   | { type: 'buzz_confirmed'; position: number }  // deprecated
   | { type: 'answer_confirmed'; position: number; answer: string }  // new
+  | ({ type: 'answer_distribution' } & AnswerDistribution)  // host only, throttled
   | { type: 'answer_count_update'; count: number; total_players: number }  // new: host only
-  | { type: 'answer_revealed'; answer?: string; correct_answer?: string; correct_letter?: string; scoring_results?: ScoringResult[]; leaderboard?: Player[] }
-  | { type: 'leaderboard_update'; leaderboard: Player[]; awarded_player?: string; points?: number }
+  | { type: 'answer_revealed'; answer?: string; correct_answer?: string; correct_letter?: string; scoring_results?: ScoringResult[]; answer_distribution?: AnswerDistribution; leaderboard?: Player[]; next_question_in?: number | null }
+  | { type: 'leaderboard_update'; leaderboard: Player[]; awarded_player?: string; points?: number; awarded?: Record<string, number>; kicked?: string[] }
+  | { type: 'batch_rejected'; errors: string[] }
   | { type: 'timer_updated'; seconds: number }
+  | { type: 'global_standings'; tournament_id: string; name: string; standings: GlobalStanding[]; total_players: number; rooms: number }  // host only, throttled
+  | { type: 'question_queue_updated'; queue: string[]; auto_advance: boolean; pause_seconds: number; missing?: unknown[] }  // host only
   | { type: 'question_cleared' }
   | { type: 'kicked' }
   | { type: 'mini_game_update'; positions: Record<string, MiniGamePosition>; winners: string[] }